@@ -1,12 +1,19 @@
+import os
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 import plotly.graph_objects as go
 import numpy as np
 from datetime import datetime
-from prophet import Prophet
-from sklearn.metrics import mean_absolute_error, mean_squared_error
+from backtest import backtest_frame
+from comparison import compare_assets
+from export import EXPORT_DIR, export_analysis
+from fetcher import SymbolNotFoundError, get_scheduler
+from fundamentals import RATIO_GROUPS, compute_ratios, peer_ratios, statement_panel
+from indicators import DEFAULT_INDICATORS, FIBONACCI_LEVELS, INDICATORS, calculate_fibonacci_levels, find_crosses
+from loaders import DEFAULT_START, INDICATOR_CACHE, get_comparison_closes, load_forecast, load_fundamentals, load_indicator_frame, load_peer_fundamentals, load_price_frame
+from screener import EXAMPLE_QUERIES, PRICE_COLUMNS, SCREENER_UNIVERSE_FILE, ScreenerIndex, load_universe
 from translations import bilanco_translations, gelir_tablosu_translations, nakit_akisi_translations
+from warmer import CacheWarmer, UsageTracker
 
 
 st.set_page_config(
@@ -58,68 +65,43 @@ st.markdown("""
 ###########################
 # Yardımcı Fonksiyonlar
 ###########################
-def calculate_rsi(data, periods=14):
-    delta = data['Kapanış'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=periods).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=periods).mean()
-    rs = gain / loss
-    return 100 - (100 / (1 + rs))
-
-def calculate_bollinger_bands(data, window=20, num_std=2):
-    sma = data['Kapanış'].rolling(window=window).mean()
-    std = data['Kapanış'].rolling(window=window).std()
-    upper_band = sma + (std * num_std)
-    lower_band = sma - (std * num_std)
-    return sma, upper_band, lower_band
-
-def calculate_macd(data, fast=12, slow=26, signal=9):
-    ema_fast = data['Kapanış'].ewm(span=fast, adjust=False).mean()
-    ema_slow = data['Kapanış'].ewm(span=slow, adjust=False).mean()
-    macd = ema_fast - ema_slow
-    signal_line = macd.ewm(span=signal, adjust=False).mean()
-    histogram = macd - signal_line
-    return macd, signal_line, histogram
-
 def translate_index(df, translation_dict):
     df = df.copy()
     df.index = [translation_dict.get(i, i) for i in df.index]
     return df
 
-def calculate_ichimoku(data):
-    tenkan_sen = (data['Yüksek'].rolling(9).max() + data['Düşük'].rolling(9).min()) / 2
-    kijun_sen = (data['Yüksek'].rolling(26).max() + data['Düşük'].rolling(26).min()) / 2
-    senkou_span_a = (tenkan_sen + kijun_sen) / 2
-    senkou_span_b = (data['Yüksek'].rolling(52).max() + data['Düşük'].rolling(52).min()) / 2
-    return tenkan_sen, kijun_sen, senkou_span_a, senkou_span_b
-
-def get_total_returns(ticker):
-    end_date = datetime.today()
-    start_date = end_date - pd.DateOffset(years=1)
-
-    assets = {
-        'BIST100': 'XU100.IS',
-        'Dolar': 'TRY=X',
-        'Euro': 'EURTRY=X',
-        'Altın': 'GC=F',
-        'Gümüş': 'SI=F',
-        'Bitcoin': 'BTC-USD',
-        'Hisse': ticker
-    }
+COMPARISON_WINDOWS = [20, 60, 120, 252]
 
-    returns = {}
-    for name, symbol in assets.items():
-        try:
-            data = yf.download(symbol, start=start_date, end=end_date, progress=False)
-            if not data.empty:
-                start_price = data['Close'].iloc[0]
-                end_price = data['Close'].iloc[-1]
-                returns[name] = float(((end_price - start_price) / start_price) * 100)
-        except Exception as e:
-            print(f"{name} hata: {e}")
-            continue
+# Her bölümün ihtiyaç duyduğu göstergeler; yalnızca görünür bölümlerinkiler (ve bağımlılıkları) hesaplanır
+SECTION_INDICATORS = {
+    'Fiyat ve Ortalamalar': [('MA', {'window': 20}), ('MA', {'window': 50}), ('MA', {'window': 200})],
+    'RSI': [('RSI', {})],
+    'Bollinger Bantları': [('Bollinger', {})],
+    'MACD': [('MACD', {})],
+    'Hacim': [],
+    'Hacim Farkı': [('Hacim_Fark', {})],
+    'Fibonacci': [],
+    'Ichimoku': [('Ichimoku', {})],
+    'Sinyal Backtest': [indicator for indicator in DEFAULT_INDICATORS if indicator[0] != 'Hacim_Fark']
+}
+
+@st.cache_resource
+def get_usage_tracker():
+    return UsageTracker()
+
+@st.cache_resource
+def start_cache_warmer():
+    warmer = CacheWarmer(usage=get_usage_tracker())
+    warmer.start_schedule()
+    return warmer
+
+cache_warmer = start_cache_warmer()
 
-    return pd.DataFrame.from_dict(returns, orient='index', columns=['Getiri (%)'])
+@st.cache_resource
+def get_screener_index():
+    return ScreenerIndex()
 
+SCREENER_COLUMNS = ['Tarih', 'Kapanış', 'Değişim_1G', 'RSI', 'MACD', 'MACD_Signal', 'MA50', 'MA200', 'Bulut_Üstü', 'Golden_Cross_Gün', 'Death_Cross_Gün']
 
 
 ###########################
@@ -128,32 +110,58 @@ def get_total_returns(ticker):
 with st.sidebar:
     st.header("Analiz Parametreleri")
     ticker = st.text_input("Hisse Senedi Sembolü", "KCHOL.IS")
-    start_date = st.date_input("Başlangıç Tarihi", datetime(2020, 1, 1))
+    start_date = st.date_input("Başlangıç Tarihi", DEFAULT_START)
     end_date = st.date_input("Bitiş Tarihi", datetime.today())
+    extra_symbols_text = st.text_input("Ek Karşılaştırma Sembolleri", "", help="Virgülle ayırarak girin (ör. THYAO.IS, GARAN.IS)")
+    extra_symbols = [symbol.strip() for symbol in extra_symbols_text.split(',') if symbol.strip()]
+    visible_sections = st.multiselect("Gösterilecek Bölümler", list(SECTION_INDICATORS), default=list(SECTION_INDICATORS))
+
+    with st.expander("⚙️ Gösterge Parametreleri"):
+        indicator_params = {
+            'RSI': {'periods': st.number_input("RSI Periyodu", 2, 100, 14)},
+            'Bollinger': {
+                'window': st.number_input("Bollinger Penceresi", 5, 200, 20),
+                'num_std': st.number_input("Bollinger Standart Sapma", 0.5, 5.0, 2.0, step=0.5)
+            },
+            'MACD': {
+                'fast': st.number_input("MACD Hızlı EMA", 2, 100, 12),
+                'slow': st.number_input("MACD Yavaş EMA", 3, 200, 26),
+                'signal': st.number_input("MACD Sinyal", 2, 100, 9)
+            }
+        }
+        if indicator_params['MACD']['fast'] >= indicator_params['MACD']['slow']:
+            indicator_params['MACD'] = dict(INDICATORS['MACD']['params'])
+            st.error("MACD hızlı EMA periyodu yavaş periyottan küçük olmalı; varsayılan 12/26/9 kullanılıyor.")
+    requested_indicators = [
+        (name, {**params, **indicator_params.get(name, {})})
+        for section in visible_sections
+        for name, params in SECTION_INDICATORS[section]
+    ]
 
     if st.button("Analizi Başlat", type="primary", use_container_width=True):
         try:
-            data = yf.download(ticker, start=start_date, end=end_date)
-            if data.empty:
-                st.error("Veri bulunamadı. Lütfen geçerli bir sembol girin.")
-            else:
-                data = data.reset_index()
-                data_new = data[['Date', 'Close', 'Volume', 'High', 'Low']].copy()
-                data_new.columns = ['Tarih', 'Kapanış', 'Hacim', 'Yüksek', 'Düşük']
-                data_new['Tarih'] = pd.to_datetime(data_new['Tarih'])
-                data_new['MA20'] = data_new['Kapanış'].rolling(20).mean()
-                data_new['MA50'] = data_new['Kapanış'].rolling(50).mean()
-                data_new['MA200'] = data_new['Kapanış'].rolling(200).mean()
-                data_new['RSI'] = calculate_rsi(data_new)
-                data_new['BB_SMA'], data_new['BB_Upper'], data_new['BB_Lower'] = calculate_bollinger_bands(data_new)
-                data_new['MACD'], data_new['MACD_Signal'], data_new['MACD_Hist'] = calculate_macd(data_new)
-                data_new['Hacim_Fark'] = data_new['Hacim'].diff()
-                data_new['Tenkan_Sen'], data_new['Kijun_Sen'], data_new['Senkou_Span_A'], data_new['Senkou_Span_B'] = calculate_ichimoku(data_new)
-
-                st.session_state.data = data_new
+            get_usage_tracker().record(ticker)
+            price_frame = load_price_frame(ticker, start_date, end_date)
+            st.session_state.analysis = (ticker, start_date, end_date)
+            if end_date >= datetime.today().date():
+                screener_index = get_screener_index()
+                if screener_index.ingest(ticker, price_frame[PRICE_COLUMNS]):
+                    screener_index.save()
+        except LookupError:
+            st.error("Veri bulunamadı. Lütfen geçerli bir sembol girin.")
         except Exception as e:
             st.error(f"Hata oluştu: {str(e)}")
 
+    if 'analysis' in st.session_state and st.button("💾 Analizi Parquet Olarak Kaydet", use_container_width=True):
+        try:
+            export_ticker = st.session_state.analysis[0]
+            export_forecast, _ = load_forecast(*st.session_state.analysis)
+            # Dışa aktarma görünür bölümlerden bağımsız olarak tüm varsayılan göstergeleri içerir
+            written = export_analysis(export_ticker, load_indicator_frame(*st.session_state.analysis), export_forecast)
+            st.success(f"{export_ticker} analizi kaydedildi ({EXPORT_DIR}): " + ", ".join(f"{table}: {rows} satır" for table, rows in written.items()))
+        except Exception as e:
+            st.error(f"Dışa aktarma hatası: {str(e)}")
+
 ###########################
 # Ana Başlık
 ###########################
@@ -161,12 +169,10 @@ st.title("📈 Hisse Senedi Analiz Dashboard")
 
 if 'bist100_value' not in st.session_state or 'bankacilik_value' not in st.session_state or 'btc_value' not in st.session_state:
     try:
-        bist100_data = yf.download("XU100.IS", period="1d")['Close'].iloc[-1]
-        bankacilik_data = yf.download("XBANK.IS", period="1d")['Close'].iloc[-1]
-        btc = yf.download("BTC-USD", period="1d")['Close'].iloc[-1]
-        st.session_state.bist100_value = float(bist100_data)
-        st.session_state.bankacilik_value = float(bankacilik_data)
-        st.session_state.btc_value = float(btc)
+        quotes = get_scheduler().download(["XU100.IS", "XBANK.IS", "BTC-USD"], period="5d")['Close'].ffill().iloc[-1]
+        st.session_state.bist100_value = float(quotes["XU100.IS"])
+        st.session_state.bankacilik_value = float(quotes["XBANK.IS"])
+        st.session_state.btc_value = float(quotes["BTC-USD"])
     except Exception:
         st.session_state.bist100_value = None
         st.session_state.bankacilik_value = None
@@ -186,352 +192,373 @@ st.markdown("---")
 ###########################
 # Teknik Analiz Dashboard
 ###########################
-if 'data' in st.session_state:
-    data_new = st.session_state.data
+if 'analysis' in st.session_state:
+    data_new = load_indicator_frame(*st.session_state.analysis, indicators=requested_indicators)
+    st.session_state.data = data_new
     row1_col1, row1_col2 = st.columns(2)
 
     with row1_col1:
-        df_prophet = data_new[['Tarih', 'Kapanış']].rename(columns={'Tarih': 'ds', 'Kapanış': 'y'})
-        model = Prophet(daily_seasonality=True)
-        model.fit(df_prophet)
-        future = model.make_future_dataframe(periods=60)
-        forecast = model.predict(future)
-
-        merged = pd.merge(data_new[['Tarih', 'Kapanış']], forecast[['ds', 'yhat']], left_on='Tarih', right_on='ds', how='inner')
-        mae = mean_absolute_error(merged['Kapanış'], merged['yhat'])
-        mse = mean_squared_error(merged['Kapanış'], merged['yhat'])
-        rmse = np.sqrt(mse)
-        mape = np.mean(np.abs((merged['Kapanış'] - merged['yhat']) / merged['Kapanış'])) * 100
-
-        fig_price = go.Figure()
-        fig_price.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Kapanış'], name='Kapanış', line=dict(color='#3498db')))
-        fig_price.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['MA20'], name='20 Günlük MA', line=dict(color='#e74c3c', dash='dot')))
-        fig_price.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['MA50'], name='50 Günlük MA', line=dict(color='#2ecc71', dash='dot')))
-        fig_price.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['MA200'], name='200 Günlük MA', line=dict(color='#9b59b6', dash='dot')))
-
-        fig_price.add_trace(go.Scatter(
-            x=forecast['ds'],
-            y=forecast['yhat'],
-            name='Tahmin (Prophet)',
-            line=dict(color='#8e44ad', dash='dash')
-        ))
+        if 'Fiyat ve Ortalamalar' in visible_sections:
+            forecast, forecast_metrics = load_forecast(*st.session_state.analysis)
+            mae, rmse, mape = forecast_metrics['MAE'], forecast_metrics['RMSE'], forecast_metrics['MAPE']
 
-        golden_crosses = []
-        death_crosses = []
+            fig_price = go.Figure()
+            fig_price.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Kapanış'], name='Kapanış', line=dict(color='#3498db')))
+            fig_price.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['MA20'], name='20 Günlük MA', line=dict(color='#e74c3c', dash='dot')))
+            fig_price.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['MA50'], name='50 Günlük MA', line=dict(color='#2ecc71', dash='dot')))
+            fig_price.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['MA200'], name='200 Günlük MA', line=dict(color='#9b59b6', dash='dot')))
 
-        for i in range(1, len(data_new)):
-            ma50_now = data_new['MA50'].iloc[i]
-            ma200_now = data_new['MA200'].iloc[i]
-            ma50_prev = data_new['MA50'].iloc[i - 1]
-            ma200_prev = data_new['MA200'].iloc[i - 1]
+            fig_price.add_trace(go.Scatter(
+                x=forecast['ds'],
+                y=forecast['yhat'],
+                name='Tahmin (Prophet)',
+                line=dict(color='#8e44ad', dash='dash')
+            ))
 
-            if pd.notna(ma50_now) and pd.notna(ma200_now) and pd.notna(ma50_prev) and pd.notna(ma200_prev):
-                if ma50_now > ma200_now and ma50_prev <= ma200_prev:
-                    golden_crosses.append((data_new['Tarih'].iloc[i], data_new['Kapanış'].iloc[i]))
-                elif ma50_now < ma200_now and ma50_prev >= ma200_prev:
-                    death_crosses.append((data_new['Tarih'].iloc[i], data_new['Kapanış'].iloc[i]))
+            golden_crosses, death_crosses = find_crosses(data_new)
 
-        for date, price in golden_crosses:
             fig_price.add_trace(go.Scatter(
-                x=[date],
-                y=[price],
+                x=golden_crosses['Tarih'],
+                y=golden_crosses['Kapanış'],
                 mode='markers+text',
                 name='Golden Cross',
                 marker=dict(color='gold', size=10, symbol='triangle-up'),
-                text=["Golden Cross"],
+                text=["Golden Cross"] * len(golden_crosses),
                 textposition="top center"
             ))
 
-        for date, price in death_crosses:
             fig_price.add_trace(go.Scatter(
-                x=[date],
-                y=[price],
+                x=death_crosses['Tarih'],
+                y=death_crosses['Kapanış'],
                 mode='markers+text',
                 name='Death Cross',
                 marker=dict(color='black', size=10, symbol='triangle-down'),
-                text=["Death Cross"],
+                text=["Death Cross"] * len(death_crosses),
                 textposition="bottom center"
             ))
 
-        support_level = data_new['Kapanış'].rolling(window=50, min_periods=1).min().iloc[-1]
-        resistance_level = data_new['Kapanış'].rolling(window=50, min_periods=1).max().iloc[-1]
-
-        fig_price.add_hline(
-            y=support_level,
-            line=dict(color='#0000FF', dash='dash', width=1.5),  
-            annotation_text=f"Destek: {support_level:.2f}",
-            annotation_position="bottom right",
-            annotation=dict(font=dict(color='#0000FF'))
-        )
-        fig_price.add_hline(
-            y=resistance_level,
-            line=dict(color='#ff0000', dash='dash', width=1.5), 
-            annotation_text=f"Direnç: {resistance_level:.2f}",
-            annotation_position="top right",
-            annotation=dict(font=dict(color='#ff0000'))
-        )
-
-
-        fig_price.add_annotation(
-            text=f"📊 Prophet Başarı:\nMAE: {mae:.2f}\nRMSE: {rmse:.2f}\nMAPE: {mape:.2f}%",
-            xref="paper", yref="paper",
-            x=0.01, y=0.99, showarrow=False,
-            align="left",
-            bgcolor="rgba(255, 255, 255, 0.85)",
-            bordercolor="#2c3e50",
-            borderwidth=1
-        )
-
-        fig_price.update_layout(
-            title='Kapanış Fiyatı ve Hareketli Ortalamalar + Prophet Tahmini',
-            xaxis_title='Tarih',
-            yaxis_title='Fiyat (TL)',
-            template='plotly_white'
-        )
-
-        st.markdown("""
-        <div style="display: flex; gap: 10px; margin-top: 10px; margin-bottom: -20px;">
-            <div style="flex: 1; background-color: #eafbea; padding: 10px; border-radius: 8px; border-left: 5px solid #27ae60;">
-                <p style="margin: 0; font-size: 13px;">✨ <strong>Son Yaşanmış Golden Cross:</strong><br>""" + 
-                (golden_crosses[-1][0].strftime('%Y-%m-%d') if golden_crosses else "Yok") + """
-                </p>
+            support_level = data_new['Kapanış'].rolling(window=50, min_periods=1).min().iloc[-1]
+            resistance_level = data_new['Kapanış'].rolling(window=50, min_periods=1).max().iloc[-1]
+
+            fig_price.add_hline(
+                y=support_level,
+                line=dict(color='#0000FF', dash='dash', width=1.5),  
+                annotation_text=f"Destek: {support_level:.2f}",
+                annotation_position="bottom right",
+                annotation=dict(font=dict(color='#0000FF'))
+            )
+            fig_price.add_hline(
+                y=resistance_level,
+                line=dict(color='#ff0000', dash='dash', width=1.5), 
+                annotation_text=f"Direnç: {resistance_level:.2f}",
+                annotation_position="top right",
+                annotation=dict(font=dict(color='#ff0000'))
+            )
+
+
+            fig_price.add_annotation(
+                text=f"📊 Prophet Başarı:\nMAE: {mae:.2f}\nRMSE: {rmse:.2f}\nMAPE: {mape:.2f}%",
+                xref="paper", yref="paper",
+                x=0.01, y=0.99, showarrow=False,
+                align="left",
+                bgcolor="rgba(255, 255, 255, 0.85)",
+                bordercolor="#2c3e50",
+                borderwidth=1
+            )
+
+            fig_price.update_layout(
+                title='Kapanış Fiyatı ve Hareketli Ortalamalar + Prophet Tahmini',
+                xaxis_title='Tarih',
+                yaxis_title='Fiyat (TL)',
+                template='plotly_white'
+            )
+
+            st.markdown("""
+            <div style="display: flex; gap: 10px; margin-top: 10px; margin-bottom: -20px;">
+                <div style="flex: 1; background-color: #eafbea; padding: 10px; border-radius: 8px; border-left: 5px solid #27ae60;">
+                    <p style="margin: 0; font-size: 13px;">✨ <strong>Son Yaşanmış Golden Cross:</strong><br>""" + 
+                    (golden_crosses['Tarih'].iloc[-1].strftime('%Y-%m-%d') if not golden_crosses.empty else "Yok") + """
+                    </p>
+                </div>
+                <div style="flex: 1; background-color: #fdecea; padding: 10px; border-radius: 8px; border-left: 5px solid #c0392b;">
+                    <p style="margin: 0; font-size: 13px;">⚠️ <strong>Son Yaşanmış Death Cross:</strong><br>""" + 
+                    (death_crosses['Tarih'].iloc[-1].strftime('%Y-%m-%d') if not death_crosses.empty else "Yok") + """
+                    </p>
+                </div>
             </div>
-            <div style="flex: 1; background-color: #fdecea; padding: 10px; border-radius: 8px; border-left: 5px solid #c0392b;">
-                <p style="margin: 0; font-size: 13px;">⚠️ <strong>Son Yaşanmış Death Cross:</strong><br>""" + 
-                (death_crosses[-1][0].strftime('%Y-%m-%d') if death_crosses else "Yok") + """
-                </p>
+            """, unsafe_allow_html=True)
+
+            st.plotly_chart(fig_price, use_container_width=True)
+
+            latest_price = data_new['Kapanış'].iloc[-1]
+            ma20 = data_new['MA20'].iloc[-1]
+            ma50 = data_new['MA50'].iloc[-1]
+            ma200 = data_new['MA200'].iloc[-1]
+            trend = "Yükseliş" if ma20 > ma50 else "Düşüş"
+            trend_color = "#27ae60" if ma20 > ma50 else "#e74c3c"
+
+            st.markdown(f"""
+            <div class="info-card">
+                <h3>📈 Son Fiyat Bilgileri</h3>
+                <p style="font-size: 24px; color: {trend_color};">{latest_price:.2f} TL</p>
+                <p>20 Günlük MA: {ma20:.2f}</p>
+                <p>50 Günlük MA: {ma50:.2f}</p>
+                <p>200 Günlük MA: {ma200:.2f}</p>
+                <p>Trend: <span style="color: {trend_color};">{trend}</span></p>
+                <p style="font-style: italic;">(Kapanış fiyatı, ortalamalar ve Prophet tahmini dahil)</p>
             </div>
-        </div>
-        """, unsafe_allow_html=True)
-
-        st.plotly_chart(fig_price, use_container_width=True)
-
-        latest_price = data_new['Kapanış'].iloc[-1]
-        ma20 = data_new['MA20'].iloc[-1]
-        ma50 = data_new['MA50'].iloc[-1]
-        ma200 = data_new['MA200'].iloc[-1]
-        trend = "Yükseliş" if ma20 > ma50 else "Düşüş"
-        trend_color = "#27ae60" if ma20 > ma50 else "#e74c3c"
-
-        st.markdown(f"""
-        <div class="info-card">
-            <h3>📈 Son Fiyat Bilgileri</h3>
-            <p style="font-size: 24px; color: {trend_color};">{latest_price:.2f} TL</p>
-            <p>20 Günlük MA: {ma20:.2f}</p>
-            <p>50 Günlük MA: {ma50:.2f}</p>
-            <p>200 Günlük MA: {ma200:.2f}</p>
-            <p>Trend: <span style="color: {trend_color};">{trend}</span></p>
-            <p style="font-style: italic;">(Kapanış fiyatı, ortalamalar ve Prophet tahmini dahil)</p>
-        </div>
-        """, unsafe_allow_html=True)
+            """, unsafe_allow_html=True)
 
     with row1_col2:
-        fig_rsi = go.Figure()
-        fig_rsi.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['RSI'], name='RSI', line=dict(color='#9b59b6')))
-        fig_rsi.update_layout(title='Göreceli Güç Endeksi (RSI)', yaxis_range=[0, 100], xaxis_title='Tarih', yaxis_title='RSI', template='plotly_white')
-        fig_rsi.add_hrect(y0=70, y1=100, line_width=0, fillcolor="red", opacity=0.1)
-        fig_rsi.add_hrect(y0=0, y1=30, line_width=0, fillcolor="green", opacity=0.1)
-        st.plotly_chart(fig_rsi, use_container_width=True)
-
-        latest_rsi = data_new['RSI'].iloc[-1]
-        rsi_status = "Aşırı Alım" if latest_rsi > 70 else ("Aşırı Satım" if latest_rsi < 30 else "Normal")
-        rsi_color = "#e74c3c" if latest_rsi > 70 else ("#27ae60" if latest_rsi < 30 else "#2c3e50")
-        st.markdown(f"""
-        <div class="info-card">
-            <h3>💹 RSI Durumu</h3>
-            <p style="font-size: 24px; color: {rsi_color};">{latest_rsi:.1f}</p>
-            <p>Durum: {rsi_status}</p>
-            <p style="font-style: italic;">(RSI grafiği ile aşırı alım/satım durumunun belirlenmesi)</p>
-        </div>
-        """, unsafe_allow_html=True)
+        if 'RSI' in visible_sections:
+            fig_rsi = go.Figure()
+            fig_rsi.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['RSI'], name='RSI', line=dict(color='#9b59b6')))
+            fig_rsi.update_layout(title='Göreceli Güç Endeksi (RSI)', yaxis_range=[0, 100], xaxis_title='Tarih', yaxis_title='RSI', template='plotly_white')
+            fig_rsi.add_hrect(y0=70, y1=100, line_width=0, fillcolor="red", opacity=0.1)
+            fig_rsi.add_hrect(y0=0, y1=30, line_width=0, fillcolor="green", opacity=0.1)
+            st.plotly_chart(fig_rsi, use_container_width=True)
+
+            latest_rsi = data_new['RSI'].iloc[-1]
+            rsi_status = "Aşırı Alım" if latest_rsi > 70 else ("Aşırı Satım" if latest_rsi < 30 else "Normal")
+            rsi_color = "#e74c3c" if latest_rsi > 70 else ("#27ae60" if latest_rsi < 30 else "#2c3e50")
+            st.markdown(f"""
+            <div class="info-card">
+                <h3>💹 RSI Durumu</h3>
+                <p style="font-size: 24px; color: {rsi_color};">{latest_rsi:.1f}</p>
+                <p>Durum: {rsi_status}</p>
+                <p style="font-style: italic;">(RSI grafiği ile aşırı alım/satım durumunun belirlenmesi)</p>
+            </div>
+            """, unsafe_allow_html=True)
 
     row2_col1, row2_col2 = st.columns(2)
 
     with row2_col1:
-        fig_bb = go.Figure()
-        fig_bb.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['BB_Upper'], name='Üst Bant', line=dict(color='#95a5a6')))
-        fig_bb.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['BB_Lower'], name='Alt Bant', line=dict(color='#95a5a6'), fill='tonexty'))
-        fig_bb.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Kapanış'], name='Kapanış', line=dict(color='#3498db')))
-        fig_bb.update_layout(title='Bollinger Bantları', xaxis_title='Tarih', yaxis_title='Fiyat (TL)', template='plotly_white')
-        st.plotly_chart(fig_bb, use_container_width=True)
-
-        latest_bb = data_new['Kapanış'].iloc[-1]
-        bb_position = "Üst Bandın Üzerinde" if latest_bb > data_new['BB_Upper'].iloc[-1] else ("Alt Bandın Altında" if latest_bb < data_new['BB_Lower'].iloc[-1] else "Bantlar Arasında")
-        st.markdown(f"""
-        <div class="info-card">
-            <h3>📉 Bollinger Bantları</h3>
-            <p>Son Fiyat: {latest_bb:.2f} TL</p>
-            <p>Pozisyon: {bb_position}</p>
-            <p style="font-style: italic;">(Bollinger Bantları grafiği ile fiyat volatilitesi ve konum analizi)</p>
-        </div>
-        """, unsafe_allow_html=True)
+        if 'Bollinger Bantları' in visible_sections:
+            fig_bb = go.Figure()
+            fig_bb.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['BB_Upper'], name='Üst Bant', line=dict(color='#95a5a6')))
+            fig_bb.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['BB_Lower'], name='Alt Bant', line=dict(color='#95a5a6'), fill='tonexty'))
+            fig_bb.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Kapanış'], name='Kapanış', line=dict(color='#3498db')))
+            fig_bb.update_layout(title='Bollinger Bantları', xaxis_title='Tarih', yaxis_title='Fiyat (TL)', template='plotly_white')
+            st.plotly_chart(fig_bb, use_container_width=True)
+
+            latest_bb = data_new['Kapanış'].iloc[-1]
+            bb_position = "Üst Bandın Üzerinde" if latest_bb > data_new['BB_Upper'].iloc[-1] else ("Alt Bandın Altında" if latest_bb < data_new['BB_Lower'].iloc[-1] else "Bantlar Arasında")
+            st.markdown(f"""
+            <div class="info-card">
+                <h3>📉 Bollinger Bantları</h3>
+                <p>Son Fiyat: {latest_bb:.2f} TL</p>
+                <p>Pozisyon: {bb_position}</p>
+                <p style="font-style: italic;">(Bollinger Bantları grafiği ile fiyat volatilitesi ve konum analizi)</p>
+            </div>
+            """, unsafe_allow_html=True)
 
     with row2_col2:
-        fig_macd = go.Figure()
-        fig_macd.add_trace(go.Bar(x=data_new['Tarih'], y=data_new['MACD_Hist'], name='Histogram', marker=dict(color=np.where(data_new['MACD_Hist'] < 0, '#e74c3c', '#2ecc71'))))
-        fig_macd.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['MACD'], name='MACD', line=dict(color='#3498db')))
-        fig_macd.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['MACD_Signal'], name='Sinyal', line=dict(color='#e67e22')))
-        fig_macd.update_layout(title='MACD Göstergesi', xaxis_title='Tarih', yaxis_title='Değer', template='plotly_white')
-        st.plotly_chart(fig_macd, use_container_width=True)
-
-        latest_macd = data_new['MACD'].iloc[-1]
-        latest_macd_signal = data_new['MACD_Signal'].iloc[-1]
-        st.markdown(f"""
-        <div class="info-card">
-            <h3>📊 MACD Bilgisi</h3>
-            <p>MACD: {latest_macd:.2f}</p>
-            <p>Sinyal: {latest_macd_signal:.2f}</p>
-            <p style="font-style: italic;">(MACD grafiği ile trend dönüşü ve momentum analizi)</p>
-        </div>
-        """, unsafe_allow_html=True)
+        if 'MACD' in visible_sections:
+            fig_macd = go.Figure()
+            fig_macd.add_trace(go.Bar(x=data_new['Tarih'], y=data_new['MACD_Hist'], name='Histogram', marker=dict(color=np.where(data_new['MACD_Hist'] < 0, '#e74c3c', '#2ecc71'))))
+            fig_macd.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['MACD'], name='MACD', line=dict(color='#3498db')))
+            fig_macd.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['MACD_Signal'], name='Sinyal', line=dict(color='#e67e22')))
+            fig_macd.update_layout(title='MACD Göstergesi', xaxis_title='Tarih', yaxis_title='Değer', template='plotly_white')
+            st.plotly_chart(fig_macd, use_container_width=True)
+
+            latest_macd = data_new['MACD'].iloc[-1]
+            latest_macd_signal = data_new['MACD_Signal'].iloc[-1]
+            st.markdown(f"""
+            <div class="info-card">
+                <h3>📊 MACD Bilgisi</h3>
+                <p>MACD: {latest_macd:.2f}</p>
+                <p>Sinyal: {latest_macd_signal:.2f}</p>
+                <p style="font-style: italic;">(MACD grafiği ile trend dönüşü ve momentum analizi)</p>
+            </div>
+            """, unsafe_allow_html=True)
 
     row3_col1, row3_col2 = st.columns(2)
 
     with row3_col1:
-        fig_vol = go.Figure()
-        fig_vol.add_trace(go.Bar(x=data_new['Tarih'], y=data_new['Hacim'], name='Hacim'))
-        fig_vol.update_traces(marker_color='#0000FF', marker_line_width=0, marker_opacity=1)
-        fig_vol.update_layout(title='Hacim Zaman Serisi', xaxis_title='Tarih', yaxis_title='Hacim', template='plotly_white')
-        st.plotly_chart(fig_vol, use_container_width=True)
+        if 'Hacim' in visible_sections:
+            fig_vol = go.Figure()
+            fig_vol.add_trace(go.Bar(x=data_new['Tarih'], y=data_new['Hacim'], name='Hacim'))
+            fig_vol.update_traces(marker_color='#0000FF', marker_line_width=0, marker_opacity=1)
+            fig_vol.update_layout(title='Hacim Zaman Serisi', xaxis_title='Tarih', yaxis_title='Hacim', template='plotly_white')
+            st.plotly_chart(fig_vol, use_container_width=True)
+
+            latest_volume = data_new['Hacim'].iloc[-1]
+            st.markdown(f"""
+            <div class="info-card">
+                <h3>📊 Hacim Bilgisi</h3>
+                <p>Son Hacim: {latest_volume:,.0f}</p>
+                <p style="font-style: italic;">(Hacim grafiği ile işlem yoğunluğu analizi)</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with row3_col2:
+        if 'Hacim Farkı' in visible_sections:
+            fig_vol_diff = go.Figure()
+            fig_vol_diff.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Hacim_Fark'], mode='lines', name='Hacim Farkı', line=dict(color='#e67e22')))
+            fig_vol_diff.update_layout(title='Günlük Hacim Farkı', xaxis_title='Tarih', yaxis_title='Hacim Farkı', template='plotly_white')
+            st.plotly_chart(fig_vol_diff, use_container_width=True)
+
+            latest_vol_diff = data_new['Hacim_Fark'].iloc[-1]
+            vol_diff_color = "#27ae60" if latest_vol_diff >= 0 else "#e74c3c"
+            st.markdown(f"""
+            <div class="info-card">
+                <h3>🔄 Günlük Hacim Değişimi</h3>
+                <p style="color:{vol_diff_color};">Son Değişim: {latest_vol_diff:,.0f}</p>
+                <p style="font-style: italic;">(Hacim farkı grafiği ile günlük hacim değişimleri takibi)</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+    ######################################
+    # Fibonacci Retracement Analizi
+    ######################################
+    if 'Fibonacci' in visible_sections:
+        st.markdown("---")
+        st.subheader("Fibonacci Retracement Analizi")
+
+        levels = FIBONACCI_LEVELS
+        retracement_levels = calculate_fibonacci_levels(data_new, levels)
+
+        fig_fib = go.Figure()
+        fig_fib.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Kapanış'], name='Kapanış', line=dict(color='#3498db')))
+        for level, retracement in zip(levels, retracement_levels):
+            fig_fib.add_hline(y=retracement, line=dict(dash='dot'), annotation_text=f'{level*100:.1f}%', annotation_position="right")
+        fig_fib.update_layout(title='Fibonacci Retracement Analizi', xaxis_title='Tarih', yaxis_title='Fiyat (TL)', template='plotly_white')
+        st.plotly_chart(fig_fib, use_container_width=True)
+
+        current_price = data_new['Kapanış'].iloc[-1]
+        fibonacci_zone = None
+        for i in range(len(retracement_levels)-1):
+            if current_price <= retracement_levels[i] and current_price > retracement_levels[i+1]:
+                fibonacci_zone = f"{levels[i]*100:.1f}% - {levels[i+1]*100:.1f}%"
+                break
+        if fibonacci_zone is None:
+            fibonacci_zone = "Üstünde (%0 seviyesi)" if current_price > retracement_levels[0] else "Altında (%100 seviyesi)"
 
-        latest_volume = data_new['Hacim'].iloc[-1]
         st.markdown(f"""
         <div class="info-card">
-            <h3>📊 Hacim Bilgisi</h3>
-            <p>Son Hacim: {latest_volume:,.0f}</p>
-            <p style="font-style: italic;">(Hacim grafiği ile işlem yoğunluğu analizi)</p>
+            <h3>🚩 Fibonacci Detayları</h3>
+            <ul>
+                <li><strong>%0 (Direnç Seviyesi):</strong> {retracement_levels[0]:.2f} TL - En yüksek fiyat; direnç bölgesi.</li>
+                <li><strong>%23.6 (Hafif Düzeltme):</strong> {retracement_levels[1]:.2f} TL - Kısa vadeli hafif geri çekilme sinyali.</li>
+                <li><strong>%38.2 (Önemli Destek/Direnç):</strong> {retracement_levels[2]:.2f} TL - İlk önemli destek/direnç noktası.</li>
+                <li><strong>%50 (Kritik Seviye):</strong> {retracement_levels[3]:.2f} TL - Güçlü geri çekilme ve denge bölgesi.</li>
+                <li><strong>%61.8 (Güçlü Destek):</strong> {retracement_levels[4]:.2f} TL - Fiyat toparlanması için kritik destek.</li>
+                <li><strong>%78.6 (Derin Düzeltme):</strong> {retracement_levels[5]:.2f} TL - Derin geri çekilme, önemli destek alanı.</li>
+                <li><strong>%100 (Destek Seviyesi):</strong> {retracement_levels[6]:.2f} TL - En düşük fiyat; kritik destek noktası.</li>
+            </ul>
+            <p>Mevcut fiyat: {current_price:.2f} TL, Fibonacci aralığında: {fibonacci_zone}</p>
+            <p style="font-style: italic;">(Grafikteki Fibonacci seviyeleri, ilgili fiyat noktaları ve açıklamaları)</p>
         </div>
         """, unsafe_allow_html=True)
 
-    with row3_col2:
-        fig_vol_diff = go.Figure()
-        fig_vol_diff.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Hacim_Fark'], mode='lines', name='Hacim Farkı', line=dict(color='#e67e22')))
-        fig_vol_diff.update_layout(title='Günlük Hacim Farkı', xaxis_title='Tarih', yaxis_title='Hacim Farkı', template='plotly_white')
-        st.plotly_chart(fig_vol_diff, use_container_width=True)
+    ######################################
+    # Ichimoku Cloud Analizi
+    ######################################
+    if 'Ichimoku' in visible_sections:
+        st.markdown("---")
+        st.subheader("Ichimoku Cloud Analizi")
+
+        fig_ichimoku = go.Figure()
+        fig_ichimoku.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Kapanış'], name='Kapanış', line=dict(color='#3498db')))
+        fig_ichimoku.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Tenkan_Sen'], name='Tenkan-Sen', line=dict(color='#e74c3c')))
+        fig_ichimoku.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Kijun_Sen'], name='Kijun-Sen', line=dict(color='#2ecc71')))
+        fig_ichimoku.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Senkou_Span_A'], name='Senkou Span A', line=dict(color='#9b59b6')))
+        fig_ichimoku.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Senkou_Span_B'], name='Senkou Span B', line=dict(color='#e67e22'), fill='tonexty', fillcolor='rgba(155, 89, 182, 0.2)'))
+        fig_ichimoku.update_layout(title='Ichimoku Cloud Analizi', xaxis_title='Tarih', yaxis_title='Fiyat (TL)', template='plotly_white')
+        st.plotly_chart(fig_ichimoku, use_container_width=True)
+
+        latest_price = data_new['Kapanış'].iloc[-1]
+        latest_tenkan = data_new['Tenkan_Sen'].iloc[-1]
+        latest_kijun = data_new['Kijun_Sen'].iloc[-1]
+        latest_span_a = data_new['Senkou_Span_A'].iloc[-1]
+        latest_span_b = data_new['Senkou_Span_B'].iloc[-1]
+
+        trend_status = "Yükseliş" if latest_price > latest_span_a and latest_price > latest_span_b else ("Düşüş" if latest_price < latest_span_a and latest_price < latest_span_b else "Nötr")
+        trend_color = "#27ae60" if trend_status == "Yükseliş" else ("#e74c3c" if trend_status == "Düşüş" else "#2c3e50")
 
-        latest_vol_diff = data_new['Hacim_Fark'].iloc[-1]
-        vol_diff_color = "#27ae60" if latest_vol_diff >= 0 else "#e74c3c"
         st.markdown(f"""
         <div class="info-card">
-            <h3>🔄 Günlük Hacim Değişimi</h3>
-            <p style="color:{vol_diff_color};">Son Değişim: {latest_vol_diff:,.0f}</p>
-            <p style="font-style: italic;">(Hacim farkı grafiği ile günlük hacim değişimleri takibi)</p>
+            <h3>☁️ Ichimoku Detayları</h3>
+            <ul>
+                <li><strong>Tenkan-Sen (Dönüş Çizgisi):</strong> {latest_tenkan:.2f} TL - 9 günlük kısa vadeli trend göstergesi.</li>
+                <li><strong>Kijun-Sen (Temel Çizgi):</strong> {latest_kijun:.2f} TL - 26 günlük orta vadeli trend ve destek/direnç.</li>
+                <li><strong>Senkou Span A (Bulut Önü A):</strong> {latest_span_a:.2f} TL - Bulutun ilk sınırı, destek/direnç seviyesi.</li>
+                <li><strong>Senkou Span B (Bulut Önü B):</strong> {latest_span_b:.2f} TL - Bulutun ikinci sınırı, uzun vadeli denge.</li>
+            </ul>
+            <p>Mevcut Fiyat: {latest_price:.2f} TL</p>
+            <p>Trend Durumu: <span style="color: {trend_color};">{trend_status}</span></p>
+            <p style="font-style: italic;">(Ichimoku grafiği ile trend yönü, momentum ve destek/direnç analizi)</p>
         </div>
         """, unsafe_allow_html=True)
 
     ######################################
-    # Fibonacci Retracement Analizi
+    # Sinyal Backtest
     ######################################
-    st.markdown("---")
-    st.subheader("Fibonacci Retracement Analizi")
-
-    low_price = data_new['Kapanış'].min()
-    high_price = data_new['Kapanış'].max()
-    diff = high_price - low_price
-
-    levels = [0, 0.236, 0.382, 0.5, 0.618, 0.786, 1]
-    retracement_levels = [high_price - level * diff for level in levels]
-
-    fig_fib = go.Figure()
-    fig_fib.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Kapanış'], name='Kapanış', line=dict(color='#3498db')))
-    for level, retracement in zip(levels, retracement_levels):
-        fig_fib.add_hline(y=retracement, line=dict(dash='dot'), annotation_text=f'{level*100:.1f}%', annotation_position="right")
-    fig_fib.update_layout(title='Fibonacci Retracement Analizi', xaxis_title='Tarih', yaxis_title='Fiyat (TL)', template='plotly_white')
-    st.plotly_chart(fig_fib, use_container_width=True)
-
-    current_price = data_new['Kapanış'].iloc[-1]
-    fibonacci_zone = None
-    for i in range(len(retracement_levels)-1):
-        if current_price <= retracement_levels[i] and current_price > retracement_levels[i+1]:
-            fibonacci_zone = f"{levels[i]*100:.1f}% - {levels[i+1]*100:.1f}%"
-            break
-    if fibonacci_zone is None:
-        fibonacci_zone = "Üstünde (%0 seviyesi)" if current_price > retracement_levels[0] else "Altında (%100 seviyesi)"
-
-    st.markdown(f"""
-    <div class="info-card">
-        <h3>🚩 Fibonacci Detayları</h3>
-        <ul>
-            <li><strong>%0 (Direnç Seviyesi):</strong> {retracement_levels[0]:.2f} TL - En yüksek fiyat; direnç bölgesi.</li>
-            <li><strong>%23.6 (Hafif Düzeltme):</strong> {retracement_levels[1]:.2f} TL - Kısa vadeli hafif geri çekilme sinyali.</li>
-            <li><strong>%38.2 (Önemli Destek/Direnç):</strong> {retracement_levels[2]:.2f} TL - İlk önemli destek/direnç noktası.</li>
-            <li><strong>%50 (Kritik Seviye):</strong> {retracement_levels[3]:.2f} TL - Güçlü geri çekilme ve denge bölgesi.</li>
-            <li><strong>%61.8 (Güçlü Destek):</strong> {retracement_levels[4]:.2f} TL - Fiyat toparlanması için kritik destek.</li>
-            <li><strong>%78.6 (Derin Düzeltme):</strong> {retracement_levels[5]:.2f} TL - Derin geri çekilme, önemli destek alanı.</li>
-            <li><strong>%100 (Destek Seviyesi):</strong> {retracement_levels[6]:.2f} TL - En düşük fiyat; kritik destek noktası.</li>
-        </ul>
-        <p>Mevcut fiyat: {current_price:.2f} TL, Fibonacci aralığında: {fibonacci_zone}</p>
-        <p style="font-style: italic;">(Grafikteki Fibonacci seviyeleri, ilgili fiyat noktaları ve açıklamaları)</p>
-    </div>
-    """, unsafe_allow_html=True)
+    if 'Sinyal Backtest' in visible_sections:
+        st.markdown("---")
+        st.subheader("🧪 Sinyal Backtest")
+
+        equity_df, backtest_metrics = backtest_frame(data_new)
+
+        fig_equity = go.Figure()
+        for column in equity_df.columns:
+            fig_equity.add_trace(go.Scatter(
+                x=equity_df.index,
+                y=equity_df[column],
+                name=column,
+                line=dict(color='#2c3e50', dash='dot') if column == 'Al ve Tut' else None
+            ))
+        fig_equity.update_layout(title='Sinyal Stratejilerinin Sermaye Eğrileri (Başlangıç = 1)', xaxis_title='Tarih', yaxis_title='Sermaye', template='plotly_white')
+        st.plotly_chart(fig_equity, use_container_width=True)
 
-    ######################################
-    # Ichimoku Cloud Analizi
-    ######################################
-    st.markdown("---")
-    st.subheader("Ichimoku Cloud Analizi")
-
-    fig_ichimoku = go.Figure()
-    fig_ichimoku.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Kapanış'], name='Kapanış', line=dict(color='#3498db')))
-    fig_ichimoku.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Tenkan_Sen'], name='Tenkan-Sen', line=dict(color='#e74c3c')))
-    fig_ichimoku.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Kijun_Sen'], name='Kijun-Sen', line=dict(color='#2ecc71')))
-    fig_ichimoku.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Senkou_Span_A'], name='Senkou Span A', line=dict(color='#9b59b6')))
-    fig_ichimoku.add_trace(go.Scatter(x=data_new['Tarih'], y=data_new['Senkou_Span_B'], name='Senkou Span B', line=dict(color='#e67e22'), fill='tonexty', fillcolor='rgba(155, 89, 182, 0.2)'))
-    fig_ichimoku.update_layout(title='Ichimoku Cloud Analizi', xaxis_title='Tarih', yaxis_title='Fiyat (TL)', template='plotly_white')
-    st.plotly_chart(fig_ichimoku, use_container_width=True)
-
-    latest_price = data_new['Kapanış'].iloc[-1]
-    latest_tenkan = data_new['Tenkan_Sen'].iloc[-1]
-    latest_kijun = data_new['Kijun_Sen'].iloc[-1]
-    latest_span_a = data_new['Senkou_Span_A'].iloc[-1]
-    latest_span_b = data_new['Senkou_Span_B'].iloc[-1]
-
-    trend_status = "Yükseliş" if latest_price > latest_span_a and latest_price > latest_span_b else ("Düşüş" if latest_price < latest_span_a and latest_price < latest_span_b else "Nötr")
-    trend_color = "#27ae60" if trend_status == "Yükseliş" else ("#e74c3c" if trend_status == "Düşüş" else "#2c3e50")
-
-    st.markdown(f"""
-    <div class="info-card">
-        <h3>☁️ Ichimoku Detayları</h3>
-        <ul>
-            <li><strong>Tenkan-Sen (Dönüş Çizgisi):</strong> {latest_tenkan:.2f} TL - 9 günlük kısa vadeli trend göstergesi.</li>
-            <li><strong>Kijun-Sen (Temel Çizgi):</strong> {latest_kijun:.2f} TL - 26 günlük orta vadeli trend ve destek/direnç.</li>
-            <li><strong>Senkou Span A (Bulut Önü A):</strong> {latest_span_a:.2f} TL - Bulutun ilk sınırı, destek/direnç seviyesi.</li>
-            <li><strong>Senkou Span B (Bulut Önü B):</strong> {latest_span_b:.2f} TL - Bulutun ikinci sınırı, uzun vadeli denge.</li>
-        </ul>
-        <p>Mevcut Fiyat: {latest_price:.2f} TL</p>
-        <p>Trend Durumu: <span style="color: {trend_color};">{trend_status}</span></p>
-        <p style="font-style: italic;">(Ichimoku grafiği ile trend yönü, momentum ve destek/direnç analizi)</p>
-    </div>
-    """, unsafe_allow_html=True)
+        st.dataframe(backtest_metrics.style.format("{:.2f}", na_rep="N/A", subset=backtest_metrics.columns.drop('İşlem Sayısı')), use_container_width=True)
+
+        rsi_params, bollinger_params, macd_params = (indicator_params[name] for name in ('RSI', 'Bollinger', 'MACD'))
+        st.markdown(f"""
+        <div class="info-card">
+            <h3>🧪 Backtest Varsayımları</h3>
+            <p>Sinyaller kapanışta oluşur, pozisyon bir sonraki gün açılır. Her pozisyon değişiminde %0.1 işlem maliyeti düşülür.</p>
+            <p style="font-style: italic;">(RSI({rsi_params['periods']}) 30/70, Bollinger({bollinger_params['window']}, {bollinger_params['num_std']}) bant dışı, MACD({macd_params['fast']}, {macd_params['slow']}, {macd_params['signal']}) kesişimi, Golden/Death Cross ve Ichimoku bulut konumu sinyallerinin geçmiş performansı)</p>
+        </div>
+        """, unsafe_allow_html=True)
 
     st.markdown("---")
     st.subheader("📊 Getiri Karşılaştırması (Son 1 Yıl)")
 
-    returns_df = get_total_returns(ticker)
+    comparison_missing = []
+    try:
+        comparison_closes, comparison_missing = get_comparison_closes(ticker, extra_symbols)
+    except SymbolNotFoundError as e:
+        comparison_closes, comparison_missing = pd.DataFrame(), e.missing
+    except Exception:
+        comparison_closes = pd.DataFrame()
+
+    if comparison_missing:
+        st.warning(f"Veri bulunamayan semboller karşılaştırmaya eklenmedi: {', '.join(comparison_missing)}")
+
+    if not comparison_closes.empty:
+        comparison_window = st.select_slider("Volatilite / Beta / Korelasyon Penceresi (Gün)", options=COMPARISON_WINDOWS, value=60)
+        summary_df, correlation_df = compare_assets(comparison_closes, benchmark='BIST100', window=comparison_window, return_windows=COMPARISON_WINDOWS[:-1])
 
-    if not returns_df.empty:
+        returns_df = summary_df[['Getiri (%)']].dropna().copy()
         returns_df["Varlık"] = returns_df.index
         returns_df = returns_df.sort_values("Getiri (%)", ascending=True).reset_index(drop=True)
 
-        fig_returns = go.Figure()
-        for i, row in returns_df.iterrows():
-            color = '#f39c12' if row['Varlık'] == 'Hisse' else ('#e74c3c' if row['Getiri (%)'] < 0 else '#2ecc71')
-            text_value = f"{row['Getiri (%)']:.2f}%"
-            
-            fig_returns.add_trace(go.Bar(
-                x=[row['Varlık']],
-                y=[row['Getiri (%)']],
-                marker_color=color,
-                text=text_value,
-                textposition='auto',
-                width=[0.5],
-                hovertemplate='%{x}<br>Getiri: %{y:.2f}%<extra></extra>',
-                textfont=dict(
-                    family="Arial Black",
-                    size=14,
-                    color="#2c3e50"
-                )
-            ))
+        colors = np.where(returns_df['Varlık'] == 'Hisse', '#f39c12', np.where(returns_df['Getiri (%)'] < 0, '#e74c3c', '#2ecc71'))
+        fig_returns = go.Figure(go.Bar(
+            x=returns_df['Varlık'],
+            y=returns_df['Getiri (%)'],
+            marker_color=colors,
+            text=[f"{value:.2f}%" for value in returns_df['Getiri (%)']],
+            textposition='auto',
+            width=0.5,
+            hovertemplate='%{x}<br>Getiri: %{y:.2f}%<extra></extra>',
+            textfont=dict(
+                family="Arial Black",
+                size=14,
+                color="#2c3e50"
+            )
+        ))
 
         fig_returns.update_layout(
             height=450,
@@ -549,6 +576,25 @@ if 'data' in st.session_state:
             uniformtext_mode='hide'
         )
         st.plotly_chart(fig_returns, use_container_width=True)
+
+        st.markdown("### 📐 Göreceli Performans Metrikleri")
+        st.dataframe(summary_df.style.format("{:.2f}", na_rep="N/A"), use_container_width=True)
+
+        fig_corr = go.Figure(go.Heatmap(
+            z=correlation_df.values,
+            x=correlation_df.columns,
+            y=correlation_df.index,
+            zmin=-1,
+            zmax=1,
+            colorscale='RdBu',
+            hovertemplate='%{y} / %{x}<br>Korelasyon: %{z:.2f}<extra></extra>'
+        ))
+        fig_corr.update_layout(
+            title=f'Getiri Korelasyon Matrisi (Son {comparison_window} Gün)',
+            height=max(450, 18 * len(correlation_df)),
+            template='plotly_white'
+        )
+        st.plotly_chart(fig_corr, use_container_width=True)
     else:
         st.warning("Getiri verileri alınamadı.")
 
@@ -560,12 +606,12 @@ if 'data' in st.session_state:
     st.markdown("---")
     st.subheader("🏢 Şirket Bilgileri ve Finansal Tablolar")
 
-    ticker_object = yf.Ticker(ticker)
     try:
-        info = ticker_object.info
-        balance_sheet = ticker_object.balance_sheet
-        income_statement = ticker_object.financials
-        cash_flow = ticker_object.cashflow
+        fundamentals = load_fundamentals(ticker)
+        info = fundamentals['info']
+        balance_sheet = fundamentals['balance_sheet']
+        income_statement = fundamentals['financials']
+        cash_flow = fundamentals['cashflow']
 
         st.markdown(f"""
         <div class="info-card">
@@ -577,7 +623,7 @@ if 'data' in st.session_state:
         """, unsafe_allow_html=True)
 
         def format_numbers(df):
-            return df.applymap(lambda x: "{:,.0f}".format(x) if pd.notnull(x) else "N/A")
+            return df.map(lambda x: "{:,.0f}".format(x) if pd.notnull(x) else "N/A")
 
         def format_dates(df):
             df.columns = [pd.to_datetime(col).strftime('%Y-%m-%d') if pd.notnull(col) else col for col in df.columns]
@@ -626,9 +672,70 @@ if 'data' in st.session_state:
         </div>
         """, unsafe_allow_html=True)
 
+        st.markdown("### 📐 Finansal Oranlar")
+        ratios = compute_ratios(statement_panel({ticker: fundamentals}))
+        if not ratios.empty:
+            ratio_history = ratios.droplevel('Hisse').T
+            ratio_history.columns = ratio_history.columns.strftime('%Y-%m-%d')
+            ratio_tabs = st.tabs(list(RATIO_GROUPS))
+            for tab, names in zip(ratio_tabs, RATIO_GROUPS.values()):
+                with tab:
+                    st.dataframe(ratio_history.loc[names].style.format("{:.2f}", na_rep="N/A"), use_container_width=True)
+
+        peer_symbols_text = st.text_input("Emsal Hisseler", "", help="Oran karşılaştırması için virgülle ayırarak girin (ör. THYAO.IS, PGSUS.IS)")
+        peer_symbols = [symbol.strip() for symbol in peer_symbols_text.split(',') if symbol.strip()]
+        if peer_symbols:
+            peer_fundamentals = load_peer_fundamentals(list(dict.fromkeys([ticker] + peer_symbols)))
+            _, peers = peer_ratios(peer_fundamentals)
+            missing_peers = [symbol for symbol in peer_symbols if symbol not in peers.index]
+            if missing_peers:
+                st.warning(f"Finansal tabloları alınamayan hisseler: {', '.join(missing_peers)}")
+            if not peers.empty:
+                peers['Dönem'] = peers['Dönem'].dt.strftime('%Y-%m-%d')
+                st.dataframe(peers.style.format("{:.2f}", na_rep="N/A", subset=peers.columns.drop('Dönem')), use_container_width=True)
+
+        st.markdown(f"""
+        <div class="info-card">
+            <h3>Ne İşe Yarar?</h3>
+            <p style="font-style: italic;">Marj, kaldıraç, likidite ve büyüme oranları tüm raporlama dönemleri için hesaplanır; emsal tablosu her hissenin son dönemini ve emsal medyanını gösterir.</p>
+        </div>
+        """, unsafe_allow_html=True)
+
     except Exception as e:
         st.warning(f"Şirket bilgileri alınamadı. Hata: {str(e)}")
 
+######################################
+# Çoklu Hisse Taraması
+######################################
+st.markdown("---")
+st.subheader("🔍 Çoklu Hisse Taraması")
+
+screener_index = get_screener_index()
+query_name = st.selectbox("Hazır Sorgular", list(EXAMPLE_QUERIES))
+screener_query = st.text_input("Tarama Sorgusu", EXAMPLE_QUERIES[query_name], help="Sütun adları, karşılaştırmalar (<, <=, >, >=, ==, !=) ve and/or/not kullanılabilir. Örn: RSI < 30 and Bulut_Üstü and Golden_Cross_Gün <= 20")
+
+screener_universe = load_universe()
+if not os.path.exists(SCREENER_UNIVERSE_FILE):
+    st.caption(f"Sembol listesi bulunamadı ({SCREENER_UNIVERSE_FILE}); önbellek ısıtma listesindeki {len(screener_universe)} sembol taranıyor.")
+
+if st.button("Tarama Endeksini Güncelle"):
+    with st.spinner("Yeni barlar indiriliyor..."):
+        try:
+            updated = screener_index.update(screener_universe)
+            st.success(f"{len(updated)} hisse güncellendi.")
+        except Exception as e:
+            st.error(f"Endeks güncellenemedi: {str(e)}")
+
+if screener_index.index.empty:
+    st.info("Tarama endeksi boş. Endeksi güncelleyin veya hisse analizi başlatın.")
+else:
+    try:
+        screener_results = screener_index.query(screener_query)
+        st.caption(f"{len(screener_results)} / {len(screener_index.index)} hisse eşleşti · Son bar: {screener_index.index['Tarih'].max():%Y-%m-%d}")
+        st.dataframe(screener_results[SCREENER_COLUMNS], use_container_width=True)
+    except Exception as e:
+        st.error(f"Sorgu hatası: {str(e)}")
+
 ###########################
 # Gösterge Açıklamaları
 ###########################
@@ -676,11 +783,30 @@ with st.expander("📌 Gösterge Açıklamaları"):
     - **Gelir Tablosu**: Belirli bir dönemdeki gelir, gider ve kâr/zarar bilgilerini sunar.
     - **Nakit Akışı**: Şirketin faaliyet, yatırım ve finansman kaynaklı nakit giriş/çıkışlarını gösterir.
 
-    **10. Getiri Karşılaştırması (Piyasa Karşılaştırması)**
+    **10. Sinyal Backtest**
+    - Göstergelerden üretilen al/sat sinyalleri geçmiş veri üzerinde pozisyona çevrilir.
+    - Her strateji için sermaye eğrisi, toplam/yıllık getiri, maksimum düşüş, Sharpe oranı ve isabet oranı hesaplanır.
+    - Sonuçlar "Al ve Tut" stratejisi ile karşılaştırılır; geçmiş performans gelecek için garanti değildir.
+
+    **11. Çoklu Hisse Taraması**
+    - Her hisse için göstergelerin son değerleri tek bir tabloda tutulur ve yeni barlar geldikçe güncellenir.
+    - Sorgular (ör. `RSI < 30 and Bulut_Üstü and Golden_Cross_Gün <= 20`) tüm hisseler üzerinde anında çalışır.
+    - `Golden_Cross_Gün` / `Death_Cross_Gün`: son kesişimden bu yana geçen işlem günü sayısı.
+
+    **12. Getiri Karşılaştırması (Piyasa Karşılaştırması)**
     - Seçilen hissenin son 1 yıldaki performansı, diğer yatırım araçlarıyla (BIST 100, Dolar, Euro, Altın, Gümüş, Bitcoin) karşılaştırılır.
     - Her varlık için yıllık yüzdelik getiri hesaplanır ve görselleştirilir.
     - Renkli bar grafik sayesinde kullanıcı, alternatif yatırım araçları arasında karşılaştırmalı değerlendirme yapabilir.
     - **Yeşil**: Pozitif getiri, **Kırmızı**: Negatif getiri, **Sarı**: Analiz edilen hisseyi temsil eder.
+    - Kenar çubuğundan eklenen ek semboller de aynı takvim üzerinde karşılaştırmaya dahil edilir.
+    - Seçilen pencere için dönemsel getiri, yıllıklandırılmış volatilite, maksimum düşüş, BIST 100'e göre beta ve korelasyon matrisi gösterilir.
     """)
+with st.sidebar.expander("📡 Veri Erişim Metrikleri"):
+    st.json(get_scheduler().metrics())
+    st.markdown("**Gösterge Önbelleği**")
+    st.json(INDICATOR_CACHE.stats())
+    st.markdown("**Önbellek Isıtma**")
+    st.json(cache_warmer.last_report or {"durum": f"Henüz çalışmadı, sonraki çalışma {cache_warmer.seconds_until_next_run() / 3600:.1f} saat sonra"})
+
 st.markdown("---")
 st.caption("© 2025 Hisse Analiz Paneli - Tüm hakları saklıdır.")
@@ -0,0 +1,199 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+STRATEGY_NAMES = {
+    'rsi': 'RSI 30/70',
+    'bollinger': 'Bollinger Bantları',
+    'macd': 'MACD Kesişimi',
+    'ma_cross': 'Golden/Death Cross',
+    'ichimoku': 'Ichimoku Bulutu'
+}
+
+
+###########################
+# Sinyal -> Pozisyon
+###########################
+def hold_between(entries, exits):
+    # Giriş sinyalinden çıkış sinyaline kadar pozisyon taşınır (1: alış, 0: nakit)
+    state = np.where(entries, 1.0, np.where(exits, 0.0, np.nan))
+    return pd.DataFrame(state).ffill().fillna(0.0).to_numpy()
+
+def signal_positions(data_new):
+    close = data_new['Kapanış'].to_numpy()
+    cloud_top = np.fmax(data_new['Senkou_Span_A'].to_numpy(), data_new['Senkou_Span_B'].to_numpy())
+    cloud_bottom = np.fmin(data_new['Senkou_Span_A'].to_numpy(), data_new['Senkou_Span_B'].to_numpy())
+
+    entries = np.column_stack([
+        data_new['RSI'].to_numpy() < 30,
+        close < data_new['BB_Lower'].to_numpy(),
+        close > cloud_top
+    ])
+    exits = np.column_stack([
+        data_new['RSI'].to_numpy() > 70,
+        close > data_new['BB_Upper'].to_numpy(),
+        close < cloud_bottom
+    ])
+    held = hold_between(entries, exits)
+
+    positions = pd.DataFrame(index=data_new.index)
+    positions['rsi'] = held[:, 0]
+    positions['bollinger'] = held[:, 1]
+    positions['macd'] = (data_new['MACD'] > data_new['MACD_Signal']).astype(float)
+    positions['ma_cross'] = (data_new['MA50'] > data_new['MA200']).astype(float)
+    positions['ichimoku'] = held[:, 2]
+    return positions
+
+
+###########################
+# Vektörel Backtest
+###########################
+def run_backtest(close, positions, cost=0.001):
+    close = np.asarray(close, dtype=float)
+    positions = np.asarray(positions, dtype=float)
+    if positions.ndim == 1:
+        positions = positions[:, None]
+
+    returns = np.zeros_like(close)
+    returns[1:] = close[1:] / close[:-1] - 1
+    returns = np.nan_to_num(returns)
+
+    # Sinyal kapanışta oluşur, pozisyon bir sonraki bardan itibaren taşınır
+    held = np.zeros_like(positions)
+    held[1:] = positions[:-1]
+    turnover = np.abs(np.diff(held, axis=0, prepend=0.0))
+    strategy_returns = held * returns[:, None] - turnover * cost
+
+    equity = np.cumprod(1 + strategy_returns, axis=0)
+    drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1
+
+    # İşlem bazında getiri: her girişte yeni bir işlem numarası açılır; çıkış maliyeti kesilen bar kapattığı işleme aittir
+    previous_held = np.vstack([np.zeros((1, held.shape[1])), held[:-1]])
+    entries = (held > 0) & (previous_held <= 0)
+    exits = (held <= 0) & (previous_held > 0)
+    trade_ids = np.cumsum(entries, axis=0) * ((held > 0) | exits)
+    n_trades = entries.sum(axis=0)
+    offsets = np.concatenate([[0], np.cumsum(n_trades + 1)[:-1]])
+    flat_ids = (trade_ids + offsets).ravel(order='F')
+    log_returns = np.log1p(strategy_returns).ravel(order='F')
+    trade_sums = np.bincount(flat_ids, weights=log_returns * (trade_ids.ravel(order='F') > 0), minlength=int((n_trades + 1).sum()))
+    slot_columns = np.repeat(np.arange(positions.shape[1]), n_trades + 1)
+    is_trade = np.arange(len(trade_sums)) != np.repeat(offsets, n_trades + 1)
+    won = np.bincount(slot_columns, weights=(trade_sums > 0) & is_trade, minlength=positions.shape[1])
+
+    years = max(len(close) / TRADING_DAYS, 1 / TRADING_DAYS)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        volatility = strategy_returns.std(axis=0, ddof=1)
+        metrics = pd.DataFrame({
+            'Toplam Getiri (%)': (equity[-1] - 1) * 100,
+            'Yıllık Getiri (%)': (equity[-1] ** (1 / years) - 1) * 100,
+            'Maks. Düşüş (%)': drawdown.min(axis=0) * 100,
+            'Sharpe': np.where(volatility > 0, strategy_returns.mean(axis=0) / volatility * np.sqrt(TRADING_DAYS), np.nan),
+            'İşlem Sayısı': n_trades,
+            'İsabet Oranı (%)': np.where(n_trades > 0, won / np.maximum(n_trades, 1) * 100, np.nan),
+            'Piyasada Kalma (%)': held.mean(axis=0) * 100
+        })
+    return equity, metrics
+
+def backtest_frame(data_new, cost=0.001):
+    positions = signal_positions(data_new)
+    close = data_new['Kapanış'].to_numpy()
+    equity, metrics = run_backtest(close, positions.to_numpy(), cost)
+
+    names = [STRATEGY_NAMES[column] for column in positions.columns]
+    buy_hold = close / close[0]
+    equity_df = pd.DataFrame(equity, index=data_new['Tarih'], columns=names)
+    equity_df['Al ve Tut'] = buy_hold
+    metrics.index = names
+    return equity_df, metrics
+
+
+###########################
+# Parametre Taraması
+###########################
+def _rolling_mean(values, window):
+    out = np.full_like(values, np.nan)
+    cumsum = np.cumsum(np.nan_to_num(values))
+    out[window - 1:] = cumsum[window - 1:] - np.concatenate([[0.0], cumsum[:-window]])
+    out[window - 1:] /= window
+    return out
+
+def _ema(values, span):
+    return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+def _rsi(close, period):
+    delta = np.diff(close, prepend=np.nan)
+    gain = _rolling_mean(np.where(delta > 0, delta, 0.0), period)
+    loss = _rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return 100 - 100 / (1 + gain / loss)
+
+def _sweep_positions(data_new, strategy, combos):
+    close = data_new['Kapanış'].to_numpy(dtype=float)
+
+    if strategy == 'rsi':
+        rsi = {period: _rsi(close, period) for period in {c['period'] for c in combos}}
+        entries = np.column_stack([rsi[c['period']] < c['lower'] for c in combos])
+        exits = np.column_stack([rsi[c['period']] > c['upper'] for c in combos])
+        return hold_between(entries, exits)
+
+    if strategy == 'ma_cross':
+        lengths = {c['fast'] for c in combos} | {c['slow'] for c in combos}
+        means = {length: _rolling_mean(close, length) for length in lengths}
+        return np.column_stack([means[c['fast']] > means[c['slow']] for c in combos]).astype(float)
+
+    if strategy == 'macd':
+        spans = {c['fast'] for c in combos} | {c['slow'] for c in combos}
+        emas = {span: _ema(close, span) for span in spans}
+        columns = []
+        for c in combos:
+            macd = emas[c['fast']] - emas[c['slow']]
+            columns.append(macd > _ema(macd, c['signal']))
+        return np.column_stack(columns).astype(float)
+
+    if strategy == 'bollinger':
+        series = pd.Series(close)
+        stats = {window: (series.rolling(window).mean().to_numpy(), series.rolling(window).std().to_numpy())
+                 for window in {c['window'] for c in combos}}
+        entries = np.column_stack([close < stats[c['window']][0] - c['num_std'] * stats[c['window']][1] for c in combos])
+        exits = np.column_stack([close > stats[c['window']][0] + c['num_std'] * stats[c['window']][1] for c in combos])
+        return hold_between(entries, exits)
+
+    raise ValueError(f"Bilinmeyen strateji: {strategy}")
+
+def expand_grid(strategy, grid):
+    keys = list(grid)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+    if strategy in ('ma_cross', 'macd'):
+        combos = [c for c in combos if c['fast'] < c['slow']]
+    if strategy == 'rsi':
+        combos = [{'lower': 30, 'upper': 70, **c} for c in combos]
+        combos = [c for c in combos if c['lower'] < c['upper']]
+    return combos
+
+def _sweep_ticker(job):
+    ticker, data_new, strategy, combos, cost = job
+    positions = _sweep_positions(data_new, strategy, combos)
+    _, metrics = run_backtest(data_new['Kapanış'].to_numpy(), positions, cost)
+    params = pd.DataFrame(combos)
+    params.insert(0, 'Hisse', ticker)
+    return pd.concat([params, metrics], axis=1)
+
+def sweep(frames, strategy, grid, cost=0.001, max_workers=None):
+    combos = expand_grid(strategy, grid)
+    jobs = [(ticker, data_new[['Kapanış']], strategy, combos, cost) for ticker, data_new in frames.items()]
+    if not jobs or not combos:
+        return pd.DataFrame()
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(jobs) == 1:
+        results = [_sweep_ticker(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_sweep_ticker, jobs, chunksize=max(1, len(jobs) // (max_workers * 4))))
+    return pd.concat(results, ignore_index=True)
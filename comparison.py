@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+TRADING_DAYS = 252
+
+
+###########################
+# Ortak Takvim
+###########################
+def align_closes(closes):
+    if isinstance(closes, dict):
+        closes = pd.concat(closes, axis=1)
+    frame = closes.sort_index()
+    frame.index = pd.to_datetime(frame.index)
+    if frame.index.tz is not None:
+        frame.index = frame.index.tz_localize(None)
+    frame = frame[~frame.index.duplicated(keep='last')]
+    # Kripto gibi hafta sonu işlem gören varlıklar takvimi bozmasın diye sadece iş günleri tutulur
+    frame = frame[frame.index.dayofweek < 5].ffill()
+    return frame.dropna(axis=1, how='all').astype(float)
+
+
+###########################
+# Vektörel Metrikler
+###########################
+def total_returns(prices):
+    first_idx = np.argmax(~np.isnan(prices), axis=0)
+    first = prices[first_idx, np.arange(prices.shape[1])]
+    return (prices[-1] / first - 1) * 100
+
+
+def rolling_returns(prices, window):
+    if len(prices) <= window:
+        return np.full((0, prices.shape[1]), np.nan)
+    return (prices[window:] / prices[:-window] - 1) * 100
+
+
+def rolling_volatility(returns, window):
+    if len(returns) < window:
+        return np.full((0, returns.shape[1]), np.nan)
+    windows = sliding_window_view(returns, window, axis=0)
+    return np.nanstd(windows, axis=-1, ddof=1) * np.sqrt(TRADING_DAYS) * 100
+
+
+def drawdowns(prices):
+    return (prices / np.fmax.accumulate(prices, axis=0) - 1) * 100
+
+
+def betas(returns, market_returns):
+    valid = ~np.isnan(returns) & ~np.isnan(market_returns)[:, None]
+    counts = valid.sum(axis=0)
+    market = np.where(valid, market_returns[:, None], 0.0)
+    asset = np.where(valid, returns, 0.0)
+    market_mean = market.sum(axis=0) / np.maximum(counts, 1)
+    asset_mean = asset.sum(axis=0) / np.maximum(counts, 1)
+    market_dev = np.where(valid, market - market_mean, 0.0)
+    asset_dev = np.where(valid, asset - asset_mean, 0.0)
+    cov = (market_dev * asset_dev).sum(axis=0)
+    var = (market_dev ** 2).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where((counts > 1) & (var > 0), cov / var, np.nan)
+
+
+def correlation_matrix(returns):
+    # Pencerede eksik verisi olan varlıklar korelasyon dışında bırakılır (NaN)
+    complete = ~np.isnan(returns).any(axis=0)
+    corr = np.full((returns.shape[1], returns.shape[1]), np.nan)
+    if complete.sum() > 0 and len(returns) > 1:
+        sub = returns[:, complete]
+        std = sub.std(axis=0, ddof=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z = (sub - sub.mean(axis=0)) / std
+        corr[np.ix_(complete, complete)] = (z.T @ z) / (len(sub) - 1)
+    return corr
+
+
+###########################
+# Karşılaştırma Motoru
+###########################
+def compare_assets(closes, benchmark='BIST100', window=60, return_windows=(20, 60, 120)):
+    frame = align_closes(closes)
+    names = frame.columns
+    prices = frame.to_numpy()
+    returns = prices[1:] / prices[:-1] - 1
+
+    summary = pd.DataFrame(index=names)
+    summary['Getiri (%)'] = total_returns(prices)
+    for w in return_windows:
+        rolled = rolling_returns(prices, w)
+        summary[f'{w}G Getiri (%)'] = rolled[-1] if len(rolled) else np.nan
+
+    vol = rolling_volatility(returns, window)
+    summary['Volatilite (%)'] = vol[-1] if len(vol) else np.nan
+    summary['Maks. Düşüş (%)'] = np.nanmin(drawdowns(prices), axis=0)
+
+    recent = returns[-window:]
+    if benchmark in names:
+        summary['Beta'] = betas(recent, recent[:, names.get_loc(benchmark)])
+    else:
+        summary['Beta'] = np.nan
+
+    correlation = pd.DataFrame(correlation_matrix(recent), index=names, columns=names)
+    return summary, correlation
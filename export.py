@@ -0,0 +1,120 @@
+import os
+import shutil
+from urllib.parse import quote, unquote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from indicators import FIBONACCI_LEVELS, calculate_fibonacci_levels, find_crosses
+
+EXPORT_DIR = os.environ.get('HISSE_EXPORT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exports'))
+
+# Her tablonun tarih sütunu; okumada tarih aralığı filtresi bu sütuna uygulanır
+TABLE_DATE_COLUMNS = {
+    'indicators': 'Tarih',
+    'crosses': 'Tarih',
+    'fibonacci': 'Tarih',
+    'forecast': 'ds',
+    'forecast_metrics': 'Tarih'
+}
+
+PARTITIONING = ds.partitioning(pa.schema([('ticker', pa.string()), ('year', pa.int32())]), flavor='hive')
+
+
+###########################
+# Parquet Yazma
+###########################
+def _write_table(frame, table, ticker, root):
+    # Yeni dışa aktarma hissenin önceki verisinin tamamını değiştirir; yalnızca yazılan yıllar değil
+    # Hive bölüm değerleri URI kodlamasıyla yazılır (ör. GC=F -> ticker=GC%3DF)
+    shutil.rmtree(os.path.join(root, table, f"ticker={quote(ticker, safe='')}"), ignore_errors=True)
+    date_column = TABLE_DATE_COLUMNS[table]
+    frame = frame.sort_values(date_column).reset_index(drop=True)
+    frame['ticker'] = ticker
+    frame['year'] = frame[date_column].dt.year.astype('int32')
+    ds.write_dataset(
+        pa.Table.from_pandas(frame, preserve_index=False),
+        os.path.join(root, table),
+        format='parquet',
+        partitioning=PARTITIONING,
+        basename_template=f"{ticker}-{{i}}.parquet",
+        existing_data_behavior='delete_matching',
+        max_rows_per_group=64 * 1024
+    )
+
+def analysis_tables(data_new, forecast=None):
+    golden_crosses, death_crosses = find_crosses(data_new)
+    crosses = pd.concat([
+        golden_crosses.assign(Tür='Golden Cross'),
+        death_crosses.assign(Tür='Death Cross')
+    ], ignore_index=True)
+
+    fibonacci = pd.DataFrame({
+        'Tarih': data_new['Tarih'].iloc[-1],
+        'Seviye': FIBONACCI_LEVELS,
+        'Fiyat': calculate_fibonacci_levels(data_new)
+    })
+
+    tables = {'indicators': data_new, 'crosses': crosses, 'fibonacci': fibonacci}
+    if forecast is not None:
+        tables['forecast'] = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper', 'trend']]
+    return tables
+
+def export_analysis(ticker, data_new, forecast=None, root=EXPORT_DIR):
+    written = {}
+    for table, frame in analysis_tables(data_new, forecast).items():
+        frame = frame.copy()
+        frame[TABLE_DATE_COLUMNS[table]] = pd.to_datetime(frame[TABLE_DATE_COLUMNS[table]])
+        _write_table(frame, table, ticker, root)
+        written[table] = len(frame)
+    return written
+
+def export_forecast(ticker, forecast, metrics, root=EXPORT_DIR):
+    forecast = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper', 'trend']].copy()
+    forecast['ds'] = pd.to_datetime(forecast['ds'])
+    _write_table(forecast, 'forecast', ticker, root)
+    _write_table(pd.DataFrame([{'Tarih': pd.Timestamp.today().normalize(), **metrics}]), 'forecast_metrics', ticker, root)
+
+
+###########################
+# Parquet Okuma
+###########################
+def read_analysis(table, tickers=None, start=None, end=None, columns=None, root=EXPORT_DIR):
+    path = os.path.join(root, table)
+    if not os.path.isdir(path):
+        return pd.DataFrame()
+    dataset = ds.dataset(path, format='parquet', partitioning=PARTITIONING)
+    date_column = TABLE_DATE_COLUMNS[table]
+
+    # Bölüm (ticker/yıl) filtreleri dosya seviyesinde, tarih filtresi satır grubu istatistikleriyle uygulanır
+    conditions = []
+    if tickers is not None:
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        conditions.append(ds.field('ticker').isin(tickers))
+    if start is not None:
+        start = pd.Timestamp(start)
+        conditions.append(ds.field('year') >= start.year)
+        conditions.append(ds.field(date_column) >= start.to_pydatetime())
+    if end is not None:
+        end = pd.Timestamp(end)
+        conditions.append(ds.field('year') <= end.year)
+        conditions.append(ds.field(date_column) <= end.to_pydatetime())
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    if columns is not None:
+        columns = list(dict.fromkeys(['ticker', date_column] + list(columns)))
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+def list_exports(table='indicators', root=EXPORT_DIR):
+    path = os.path.join(root, table)
+    if not os.path.isdir(path):
+        return []
+    return sorted(
+        unquote(entry.split('=', 1)[1])
+        for entry in os.listdir(path)
+        if entry.startswith('ticker=')
+    )
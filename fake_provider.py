@@ -0,0 +1,166 @@
+import threading
+import time
+import zlib
+from collections import Counter, deque
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+import fetcher
+from fetcher import RateLimitError
+
+ORIGIN = pd.Timestamp('2000-01-03')
+
+PERIOD_DAYS = {'1d': 1, '5d': 5, '1mo': 21, '3mo': 63, '6mo': 126, '1y': 252, '2y': 504, '5y': 1260, '10y': 2520, 'max': None}
+
+BALANCE_SHEET_ITEMS = {
+    'Total Assets': 1.0,
+    'Current Assets': 0.45,
+    'Inventory': 0.12,
+    'Cash And Cash Equivalents': 0.1,
+    'Current Liabilities': 0.3,
+    'Total Liabilities Net Minority Interest': 0.55,
+    'Total Debt': 0.35,
+    'Stockholders Equity': 0.45,
+    'Common Stock Equity': 0.45
+}
+
+INCOME_STATEMENT_ITEMS = {
+    'Total Revenue': 1.0,
+    'Cost Of Revenue': 0.68,
+    'Gross Profit': 0.32,
+    'Operating Income': 0.15,
+    'EBITDA': 0.19,
+    'Interest Expense': 0.03,
+    'Pretax Income': 0.12,
+    'Net Income': 0.09
+}
+
+CASH_FLOW_ITEMS = {
+    'Operating Cash Flow': 0.14,
+    'Capital Expenditure': -0.06,
+    'Free Cash Flow': 0.08,
+    'Cash Dividends Paid': -0.03
+}
+
+
+###########################
+# Sahte Veri Sağlayıcı
+###########################
+class FakeProvider:
+    def __init__(self, max_calls_per_second=None, seed=0, unknown_symbols=(), latency=0.0, failure_rate=0.0):
+        self.max_calls_per_second = max_calls_per_second
+        self.seed = seed
+        self.unknown_symbols = set(unknown_symbols)
+        # latency: sabit saniye ya da (min, max) aralığı; failure_rate: çağrı başına geçici hata olasılığı
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = Counter()
+        self._recent = deque()
+        self._lock = threading.Lock()
+        self._fault_rng = np.random.default_rng(seed)
+
+    def _rng(self, symbol, stream=0):
+        return np.random.default_rng([self.seed, stream, zlib.crc32(symbol.encode())])
+
+    def _check_throttle(self, kind):
+        with self._lock:
+            self.calls[kind] += 1
+            if self.max_calls_per_second is None:
+                return
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 1.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.max_calls_per_second:
+                self.calls['throttled'] += 1
+                raise RateLimitError("Too Many Requests. Rate limited. Try after a while.")
+            self._recent.append(now)
+
+    def _simulate_upstream(self):
+        with self._lock:
+            delay = self._fault_rng.uniform(*self.latency) if isinstance(self.latency, tuple) else self.latency
+            failed = self.failure_rate > 0 and self._fault_rng.random() < self.failure_rate
+            if failed:
+                self.calls['failed'] += 1
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise ConnectionError("Simüle edilmiş sağlayıcı hatası")
+
+    def history(self, symbol, start=None, end=None, period=None):
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+        dates = pd.date_range(ORIGIN, end - pd.Timedelta(days=1), freq='D', name='Date')
+        dates = dates[dates.dayofweek < 5]
+        rng = self._rng(symbol)
+        drift, volatility = rng.uniform(-0.0002, 0.0008), rng.uniform(0.01, 0.03)
+        # Seri hep aynı başlangıçtan üretildiği için farklı tarih aralıkları birbiriyle tutarlıdır
+        close = rng.uniform(5, 500) * np.exp(np.cumsum(rng.normal(drift, volatility, len(dates))))
+        spread = np.abs(rng.normal(0, volatility, len(dates))) * close
+        frame = pd.DataFrame({
+            'Close': close,
+            'High': close + spread,
+            'Low': np.maximum(close - spread, close * 0.5),
+            'Open': close + rng.normal(0, 0.5, len(dates)) * spread,
+            'Volume': rng.integers(100_000, 10_000_000, len(dates)).astype(float)
+        }, index=dates)
+
+        if start is not None:
+            return frame[frame.index >= pd.Timestamp(start)]
+        days = PERIOD_DAYS.get(period or '1mo')
+        return frame if days is None else frame.iloc[-days:]
+
+    def download(self, symbols, start=None, end=None, period=None, **kwargs):
+        self._check_throttle('download')
+        self._simulate_upstream()
+        symbols = symbols.split() if isinstance(symbols, str) else list(symbols)
+        frames = {
+            symbol: self.history(symbol, start, end, period)
+            for symbol in symbols if symbol not in self.unknown_symbols
+        }
+        if not frames:
+            return pd.DataFrame()
+        data = pd.concat(frames, axis=1, names=['Ticker', 'Price']).swaplevel(axis=1).sort_index(axis=1)
+        return data.dropna(how='all')
+
+    def ticker_attr(self, symbol, attr):
+        self._check_throttle(attr)
+        self._simulate_upstream()
+        if symbol in self.unknown_symbols:
+            return {} if attr == 'info' else pd.DataFrame()
+        if attr == 'info':
+            return {
+                'longName': f"{symbol} Sentetik A.Ş.",
+                'sector': 'Sentetik',
+                'industry': 'Test Verisi',
+                'longBusinessSummary': 'Yük testi ve çevrimdışı geliştirme için üretilmiş sentetik şirket verisi.'
+            }
+        items = {'balance_sheet': BALANCE_SHEET_ITEMS, 'financials': INCOME_STATEMENT_ITEMS, 'cashflow': CASH_FLOW_ITEMS}.get(attr)
+        if items is None:
+            raise AttributeError(attr)
+        return self._statement(symbol, items)
+
+    def _statement(self, symbol, items):
+        rng = self._rng(symbol, stream=1)
+        periods = pd.DatetimeIndex([pd.Timestamp(year, 12, 31) for year in range(pd.Timestamp.today().year - 1, pd.Timestamp.today().year - 5, -1)])
+        scale = rng.uniform(1e9, 1e11) * np.cumprod(rng.uniform(0.85, 1.05, len(periods)))
+        values = np.outer(list(items.values()), scale) * rng.uniform(0.9, 1.1, (len(items), len(periods)))
+        return pd.DataFrame(values, index=list(items), columns=periods)
+
+
+class FakeTicker:
+    def __init__(self, provider, symbol):
+        self.provider = provider
+        self.ticker = symbol
+
+    def __getattr__(self, attr):
+        if attr in ('info', 'balance_sheet', 'financials', 'cashflow'):
+            return self.provider.ticker_attr(self.ticker, attr)
+        raise AttributeError(attr)
+
+
+def install(provider, **scheduler_options):
+    # Merkezi planlayıcının yanında doğrudan yf.download / yf.Ticker çağrıları da sahte sağlayıcıya yönlendirilir
+    yf.download = lambda symbols, **kwargs: provider.download(symbols, **kwargs)
+    yf.Ticker = lambda symbol, *args, **kwargs: FakeTicker(provider, symbol)
+    return fetcher.configure(provider=provider, **scheduler_options)
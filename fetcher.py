@@ -0,0 +1,247 @@
+import contextlib
+import itertools
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future, wait
+
+import pandas as pd
+import yfinance as yf
+from yfinance import multi as yf_multi
+
+INTERACTIVE = 0
+BACKGROUND = 10
+
+# Boş sonuç çoğunlukla geçersiz sembol demektir; anlık bir aksaklık ihtimaline karşı yalnızca bir kez yeniden denenir
+NOT_FOUND_RETRIES = 1
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class SymbolNotFoundError(LookupError):
+    # İstenen sembollerin hiçbiri için veri yok: yanlış yazılmış sembol ya da işlem günü içermeyen tarih aralığı
+    def __init__(self, missing):
+        super().__init__(f"Veri bulunamayan semboller: {', '.join(missing)}")
+        self.missing = missing
+
+
+def missing_symbols(symbols, data):
+    # yf.download hataları sembol bazında yakalayıp loglar; eksik semboller yalnızca kapanış sütunu olmadan görünür
+    requested = symbols.split() if isinstance(symbols, str) else list(symbols)
+    if data is None or data.empty:
+        raise SymbolNotFoundError(requested)
+    closes = data['Close']
+    if isinstance(closes, pd.Series):
+        available = set(requested) if closes.notna().any() else set()
+    else:
+        available = {str(symbol).upper() for symbol in closes.columns[closes.notna().any()]}
+    missing = [symbol for symbol in requested if symbol.upper() not in available]
+    if len(missing) == len(requested):
+        raise SymbolNotFoundError(requested)
+    return missing
+
+
+###########################
+# Veri Sağlayıcı
+###########################
+# Eski yfinance sürümleri indirme sonuçlarını modül seviyesindeki paylaşılan sözlüklerde topladığından eşzamanlı çağrılar
+# birbirine karışabilir; durumu çağrı başına _DownloadCtx içinde tutan sürümlerde kilide gerek yoktur
+DOWNLOAD_NEEDS_LOCK = not hasattr(yf_multi, '_DownloadCtx')
+
+
+class YahooProvider:
+    def __init__(self):
+        self._download_lock = threading.Lock() if DOWNLOAD_NEEDS_LOCK else contextlib.nullcontext()
+
+    def download(self, symbols, **kwargs):
+        kwargs.setdefault('progress', False)
+        with self._download_lock:
+            return yf.download(symbols, **kwargs)
+
+    def ticker_attr(self, symbol, attr):
+        return getattr(yf.Ticker(symbol), attr)
+
+
+###########################
+# Token Bucket
+###########################
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+###########################
+# Merkezi İstek Planlayıcı
+###########################
+class FetchScheduler:
+    def __init__(self, provider=None, rate=2.0, burst=5, workers=4, max_retries=4, base_delay=0.5, max_delay=30.0, timeout=120.0):
+        self.provider = provider or YahooProvider()
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._cooldown_until = 0.0
+        self._metrics = {
+            'requests': 0,
+            'deduplicated': 0,
+            'promoted': 0,
+            'upstream_calls': 0,
+            'retries': 0,
+            'throttled': 0,
+            'partial': 0,
+            'failures': 0,
+            'rate_limit_wait_s': 0.0,
+            'upstream_time_s': 0.0
+        }
+
+        self._workers = [threading.Thread(target=self._worker, daemon=True, name=f"fetch-worker-{i}") for i in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, key, fn, priority=INTERACTIVE):
+        with self._lock:
+            self._metrics['requests'] += 1
+            future, queued_priority = self._inflight.get(key, (None, None))
+            if future is not None and not future.done():
+                self._metrics['deduplicated'] += 1
+                if priority >= queued_priority:
+                    return future
+                # Arka planda bekleyen aynı istek daha yüksek öncelikle yeniden kuyruğa alınır; ilk alınan kayıt çalışır
+                self._metrics['promoted'] += 1
+            else:
+                future = Future()
+            self._inflight[key] = (future, priority)
+        self._queue.put((priority, next(self._sequence), key, fn, future))
+        return future
+
+    def download(self, symbols, priority=INTERACTIVE, **kwargs):
+        symbols_key = tuple(symbols) if isinstance(symbols, (list, tuple)) else symbols
+        key = ('download', symbols_key, tuple(sorted(kwargs.items())))
+        future = self.submit(key, lambda: self._checked_download(symbols, **kwargs), priority)
+        return future.result(timeout=self.timeout)
+
+    def _checked_download(self, symbols, **kwargs):
+        data = self.provider.download(symbols, **kwargs)
+        if missing_symbols(symbols, data):
+            # Toplu istekte bazı semboller (ör. işlem görmeyen) eksikse geri kalanı beklemeden kullanılır
+            self._record('partial')
+        return data
+
+    def _submit_attr(self, symbol, attr, priority):
+        return self.submit(('ticker', symbol, attr), lambda: self.provider.ticker_attr(symbol, attr), priority)
+
+    def ticker_attr(self, symbol, attr, priority=INTERACTIVE):
+        return self._submit_attr(symbol, attr, priority).result(timeout=self.timeout)
+
+    def ticker_attrs(self, symbol, attrs, priority=INTERACTIVE, timeout=None):
+        # Alanlar ayrı işçilerde eşzamanlı istenir; süre sınırı tek tek değil tüm grup için uygulanır
+        futures = {attr: self._submit_attr(symbol, attr, priority) for attr in attrs}
+        _, pending = wait(futures.values(), timeout=self.timeout if timeout is None else timeout)
+        if pending:
+            missing = [attr for attr, future in futures.items() if future in pending]
+            raise TimeoutError(f"{symbol} için süre sınırı aşıldı: {', '.join(missing)}")
+        return {attr: future.result() for attr, future in futures.items()}
+
+    def metrics(self):
+        with self._lock:
+            snapshot = dict(self._metrics)
+            snapshot['inflight'] = len(self._inflight)
+        snapshot['queued'] = self._queue.qsize()
+        return snapshot
+
+    def _record(self, name, value=1):
+        with self._lock:
+            self._metrics[name] += value
+
+    def _worker(self):
+        while True:
+            _, _, key, fn, future = self._queue.get()
+            with self._lock:
+                # Yükseltilmiş isteğin diğer kaydı çalışmaya başlamış ya da bitmişse bu kayıt atlanır
+                claimed = not (future.running() or future.done()) and future.set_running_or_notify_cancel()
+            if claimed:
+                try:
+                    future.set_result(self._execute(fn))
+                except Exception as e:
+                    self._record('failures')
+                    future.set_exception(e)
+            with self._lock:
+                if self._inflight.get(key, (None, None))[0] is future and future.done():
+                    del self._inflight[key]
+            self._queue.task_done()
+
+    def _execute(self, fn):
+        for attempt in range(self.max_retries + 1):
+            cooldown = self._cooldown_until - time.monotonic()
+            if cooldown > 0:
+                time.sleep(cooldown)
+            self._record('rate_limit_wait_s', self.bucket.acquire())
+            self._record('upstream_calls')
+            started = time.monotonic()
+            try:
+                return fn()
+            except Exception as e:
+                error = e
+            finally:
+                self._record('upstream_time_s', time.monotonic() - started)
+
+            if isinstance(error, SymbolNotFoundError) and attempt >= min(NOT_FOUND_RETRIES, self.max_retries):
+                raise error
+            if attempt == self.max_retries:
+                raise error
+            delay = min(self.max_delay, self.base_delay * 2 ** attempt) * (1 + random.random() * 0.25)
+            if _is_throttled(error):
+                # Sağlayıcı kısıtladığında tüm işçiler birlikte beklesin
+                self._record('throttled')
+                self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+            self._record('retries')
+            time.sleep(delay)
+
+
+def _is_throttled(error):
+    # Ortak bekleme yalnızca gerçek kısıtlama hatalarında uygulanır; boş sonuçlar diğer işçileri durdurmaz
+    return isinstance(error, RateLimitError) or 'RateLimit' in type(error).__name__
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = FetchScheduler()
+        return _scheduler
+
+def configure(provider=None, **options):
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = FetchScheduler(provider=provider, **options)
+        return _scheduler
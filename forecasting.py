@@ -0,0 +1,155 @@
+import argparse
+import logging
+import os
+import resource
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+from export import EXPORT_DIR, export_forecast
+from fetcher import BACKGROUND, get_scheduler
+from indicators import split_price_frames
+from screener import load_universe
+
+FORECAST_PERIODS = 60
+
+# Tüm tahminler (sayfa ve toplu iş) aynı model ayarlarıyla kurulur
+PROPHET_SETTINGS = {'daily_seasonality': True}
+
+BATCH_TIMEOUT = 300
+BATCH_HISTORY_START = date(2020, 1, 1)
+DOWNLOAD_BATCH = 100
+
+
+class ForecastTimeout(Exception):
+    pass
+
+
+###########################
+# Prophet Tahmini
+###########################
+def fit_forecast(data_new, periods=FORECAST_PERIODS, settings=None):
+    df_prophet = data_new[['Tarih', 'Kapanış']].rename(columns={'Tarih': 'ds', 'Kapanış': 'y'})
+    model = Prophet(**(settings or PROPHET_SETTINGS))
+    model.fit(df_prophet)
+    future = model.make_future_dataframe(periods=periods)
+    forecast = model.predict(future)
+
+    merged = pd.merge(data_new[['Tarih', 'Kapanış']], forecast[['ds', 'yhat']], left_on='Tarih', right_on='ds', how='inner')
+    mae = mean_absolute_error(merged['Kapanış'], merged['yhat'])
+    mse = mean_squared_error(merged['Kapanış'], merged['yhat'])
+    metrics = {
+        'MAE': mae,
+        'RMSE': np.sqrt(mse),
+        'MAPE': np.mean(np.abs((merged['Kapanış'] - merged['yhat']) / merged['Kapanış'])) * 100
+    }
+    return forecast, metrics
+
+
+###########################
+# Toplu Tahmin (İşlem Havuzu)
+###########################
+def _init_worker(memory_limit_mb):
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    logging.getLogger('prophet').setLevel(logging.WARNING)
+    if memory_limit_mb:
+        limit = int(memory_limit_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def _raise_timeout(signum, frame):
+    raise ForecastTimeout("Tahmin süresi aşıldı")
+
+def _forecast_job(job):
+    ticker, data_new, periods, settings, timeout = job
+    # İşçi süreçte görevler ana iş parçacığında çalıştığından SIGALRM ile iş başına süre sınırı uygulanabilir
+    signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    started = time.perf_counter()
+    try:
+        forecast, metrics = fit_forecast(data_new, periods, settings)
+        return ticker, forecast, metrics, time.perf_counter() - started, None
+    except Exception as e:
+        return ticker, None, None, time.perf_counter() - started, f"{type(e).__name__}: {e}"
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+def forecast_batch(series, periods=FORECAST_PERIODS, settings=None, max_workers=None, timeout=BATCH_TIMEOUT, memory_limit_mb=None, store_root=None):
+    settings = settings or PROPHET_SETTINGS
+    jobs = [(ticker, data_new[['Tarih', 'Kapanış']], periods, settings, timeout) for ticker, data_new in series.items()]
+    forecasts = {}
+    rows = []
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), initializer=_init_worker, initargs=(memory_limit_mb,)) as executor:
+        futures = {executor.submit(_forecast_job, job): job[0] for job in jobs}
+        for future in as_completed(futures):
+            try:
+                ticker, forecast, metrics, seconds, error = future.result()
+            except Exception as e:
+                ticker, forecast, metrics, seconds, error = futures[future], None, None, np.nan, f"{type(e).__name__}: {e}"
+            if forecast is not None:
+                forecasts[ticker] = forecast
+                if store_root is not None:
+                    export_forecast(ticker, forecast, {**metrics, 'Süre (sn)': seconds, 'Ufuk (Gün)': periods}, root=store_root)
+            rows.append({'Hisse': ticker, **(metrics or {}), 'Süre (sn)': seconds, 'Hata': error})
+
+    duration = time.perf_counter() - started
+    results = pd.DataFrame(rows).set_index('Hisse') if rows else pd.DataFrame()
+    fit_seconds = results['Süre (sn)'].dropna() if not results.empty else pd.Series(dtype=float)
+    stats = {
+        'series': len(jobs),
+        'succeeded': len(forecasts),
+        'failed': len(jobs) - len(forecasts),
+        'duration_s': round(duration, 2),
+        'series_per_minute': round(len(forecasts) / duration * 60, 2) if duration > 0 else np.nan,
+        'mean_fit_s': round(float(fit_seconds.mean()), 3) if len(fit_seconds) else np.nan,
+        'p95_fit_s': round(float(fit_seconds.quantile(0.95)), 3) if len(fit_seconds) else np.nan
+    }
+    return results, forecasts, stats
+
+
+###########################
+# Gece Toplu Tahmin Komutu
+###########################
+def load_series(tickers, start=BATCH_HISTORY_START, end=None):
+    end = end or date.today()
+    series = {}
+    for i in range(0, len(tickers), DOWNLOAD_BATCH):
+        batch = tickers[i:i + DOWNLOAD_BATCH]
+        data = get_scheduler().download(batch, start=start, end=end, priority=BACKGROUND)
+        series.update(split_price_frames(data, batch))
+    return series
+
+def main():
+    parser = argparse.ArgumentParser(description="Toplu Prophet tahmini")
+    parser.add_argument('tickers', nargs='*', help="Hisse sembolleri")
+    parser.add_argument('--tickers-file', help="Her satırda bir sembol içeren dosya")
+    parser.add_argument('--periods', type=int, default=FORECAST_PERIODS)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--timeout', type=float, default=BATCH_TIMEOUT, help="İş başına süre sınırı (sn)")
+    parser.add_argument('--memory-limit-mb', type=int, default=None, help="İşçi süreç başına bellek sınırı")
+    parser.add_argument('--output', default=EXPORT_DIR)
+    args = parser.parse_args()
+
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        with open(args.tickers_file, encoding='utf-8') as f:
+            tickers += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    if not tickers:
+        tickers = load_universe()
+
+    series = load_series(list(dict.fromkeys(tickers)))
+    results, _, stats = forecast_batch(series, args.periods, max_workers=args.workers, timeout=args.timeout,
+                                       memory_limit_mb=args.memory_limit_mb, store_root=args.output)
+    print(results.to_string())
+    print(stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+from translations import bilanco_translations, gelir_tablosu_translations, nakit_akisi_translations
+
+STATEMENT_TRANSLATIONS = {
+    'balance_sheet': bilanco_translations,
+    'financials': gelir_tablosu_translations,
+    'cashflow': nakit_akisi_translations
+}
+
+# Oranlar çevrilmiş kalem adlarıyla tanımlanır; c(kalem) eksik kalemler için NaN döndürür
+RATIOS = {
+    'Brüt Kâr Marjı (%)': ('Marjlar', lambda c: c('Brüt Kâr') / c('Toplam Gelir') * 100),
+    'FAVÖK Marjı (%)': ('Marjlar', lambda c: c('FAVÖK (EBITDA)') / c('Toplam Gelir') * 100),
+    'Faaliyet Kâr Marjı (%)': ('Marjlar', lambda c: c('Faaliyet Kârı') / c('Toplam Gelir') * 100),
+    'Net Kâr Marjı (%)': ('Marjlar', lambda c: c('Net Kâr') / c('Toplam Gelir') * 100),
+    'Serbest Nakit Akışı Marjı (%)': ('Marjlar', lambda c: c('Serbest Nakit Akışı') / c('Toplam Gelir') * 100),
+    'Borç / Öz Sermaye': ('Kaldıraç', lambda c: c('Toplam Borç') / c('Hisse Senedi Sahipleri Öz Sermayesi')),
+    'Yükümlülük / Varlık': ('Kaldıraç', lambda c: c('Azınlık Payları Hariç Toplam Yükümlülükler') / c('Toplam Varlıklar')),
+    'Borç / FAVÖK': ('Kaldıraç', lambda c: c('Toplam Borç') / c('FAVÖK (EBITDA)')),
+    'Faiz Karşılama': ('Kaldıraç', lambda c: c('Faaliyet Kârı') / c('Faiz Gideri').abs()),
+    'Cari Oran': ('Likidite', lambda c: c('Dönen Varlıklar') / c('Dönen Yükümlülükler')),
+    'Asit-Test Oranı': ('Likidite', lambda c: (c('Dönen Varlıklar') - c('Stoklar')) / c('Dönen Yükümlülükler')),
+    'Nakit Oranı': ('Likidite', lambda c: c('Nakit ve Nakit Benzerleri') / c('Dönen Yükümlülükler'))
+}
+
+# Büyüme oranları aynı hissenin bir önceki dönemine göre hesaplanır
+GROWTH_ITEMS = {
+    'Gelir Büyümesi (%)': 'Toplam Gelir',
+    'FAVÖK Büyümesi (%)': 'FAVÖK (EBITDA)',
+    'Net Kâr Büyümesi (%)': 'Net Kâr',
+    'Faaliyet Nakit Akışı Büyümesi (%)': 'Faaliyet Nakit Akışı'
+}
+
+RATIO_GROUPS = {}
+for _name, (_group, _) in RATIOS.items():
+    RATIO_GROUPS.setdefault(_group, []).append(_name)
+RATIO_GROUPS['Büyüme'] = list(GROWTH_ITEMS)
+
+
+###########################
+# Tablo Paneli
+###########################
+def statement_panel(statements):
+    # Satırlar (Hisse, Dönem), sütunlar çevrilmiş kalemler; üç tablo dönem tarihine göre yan yana birleştirilir
+    frames = {}
+    for ticker, fundamentals in statements.items():
+        parts = []
+        for attr, translations in STATEMENT_TRANSLATIONS.items():
+            statement = fundamentals.get(attr)
+            if statement is not None and not statement.empty:
+                parts.append(statement.rename(index=translations).T)
+        if parts:
+            frame = pd.concat(parts, axis=1)
+            # Aynı çeviriye sahip kalemlerden ilk tablodaki tutulur
+            frames[ticker] = frame.loc[:, ~frame.columns.duplicated()]
+    if not frames:
+        return pd.DataFrame(index=pd.MultiIndex.from_tuples([], names=['Hisse', 'Dönem']))
+
+    panel = pd.concat(frames, names=['Hisse', 'Dönem'])
+    panel.index = panel.index.set_levels(pd.to_datetime(panel.index.levels[1]), level='Dönem')
+    return panel.apply(pd.to_numeric, errors='coerce').sort_index()
+
+
+###########################
+# Oran Motoru
+###########################
+def compute_ratios(panel):
+    missing = pd.Series(np.nan, index=panel.index)
+
+    def column(label):
+        return panel[label] if label in panel.columns else missing
+
+    ratios = pd.DataFrame({name: formula(column) for name, (_, formula) in RATIOS.items()}, index=panel.index)
+
+    items = pd.DataFrame({name: column(label) for name, label in GROWTH_ITEMS.items()}, index=panel.index)
+    previous = items.groupby(level='Hisse').shift(1)
+    # Negatif tabandan büyüme yönü korunur (zarardan kâra geçiş pozitif görünür)
+    growth = (items - previous) / previous.abs() * 100
+
+    return pd.concat([ratios, growth], axis=1).replace([np.inf, -np.inf], np.nan)
+
+def latest_ratios(ratios):
+    # Hisse başına en az bir oranı hesaplanabilen son dönem
+    latest = ratios.dropna(how='all').groupby(level='Hisse').tail(1)
+    return latest.reset_index(level='Dönem')
+
+def peer_ratios(statements):
+    ratios = compute_ratios(statement_panel(statements))
+    if ratios.empty:
+        return ratios, ratios
+    latest = latest_ratios(ratios)
+    numeric = latest.drop(columns='Dönem')
+    peers = pd.concat([latest, numeric.median().to_frame('Emsal Medyanı').T])
+    return ratios, peers
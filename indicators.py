@@ -0,0 +1,240 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+###########################
+# Gösterge Kaydı
+###########################
+# Her gösterge girdilerini (fiyat sütunu ya da başka bir gösterge düğümü), parametrelerini ve çıktı sütunlarını bildirir.
+# Aynı ad ve parametrelere sahip düğümler (ör. MACD'nin kullandığı EMA12) grafikte bir kez hesaplanır.
+# validate, geçersiz parametre kombinasyonu için hata mesajı döndürür.
+INDICATORS = {}
+
+def register_indicator(name, outputs, params=None, inputs=None, validate=None):
+    def register(func):
+        INDICATORS[name] = {
+            'func': func,
+            'outputs': tuple(outputs),
+            'params': dict(params or {}),
+            'inputs': inputs or (lambda p: {'close': 'Kapanış'}),
+            'validate': validate or (lambda p: None)
+        }
+        return func
+    return register
+
+@register_indicator('MA', outputs=['MA{window}'], params={'window': 20})
+def calculate_ma(close, window):
+    return close.rolling(window).mean()
+
+@register_indicator('EMA', outputs=['EMA{span}'], params={'span': 12})
+def calculate_ema(close, span):
+    return close.ewm(span=span, adjust=False).mean()
+
+@register_indicator('RSI', outputs=['RSI'], params={'periods': 14})
+def calculate_rsi(close, periods):
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=periods).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=periods).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+@register_indicator('Bollinger', outputs=['BB_SMA', 'BB_Upper', 'BB_Lower'], params={'window': 20, 'num_std': 2},
+                    inputs=lambda p: {'close': 'Kapanış', 'sma': ('MA', {'window': p['window']})})
+def calculate_bollinger_bands(close, sma, window, num_std):
+    std = close.rolling(window=window).std()
+    upper_band = sma + (std * num_std)
+    lower_band = sma - (std * num_std)
+    return sma, upper_band, lower_band
+
+@register_indicator('MACD', outputs=['MACD', 'MACD_Signal', 'MACD_Hist'], params={'fast': 12, 'slow': 26, 'signal': 9},
+                    inputs=lambda p: {'ema_fast': ('EMA', {'span': p['fast']}), 'ema_slow': ('EMA', {'span': p['slow']})},
+                    validate=lambda p: None if p['fast'] < p['slow'] else "MACD hızlı EMA periyodu yavaş periyottan küçük olmalı")
+def calculate_macd(ema_fast, ema_slow, fast, slow, signal):
+    macd = ema_fast - ema_slow
+    signal_line = macd.ewm(span=signal, adjust=False).mean()
+    histogram = macd - signal_line
+    return macd, signal_line, histogram
+
+@register_indicator('Hacim_Fark', outputs=['Hacim_Fark'], inputs=lambda p: {'volume': 'Hacim'})
+def calculate_volume_diff(volume):
+    return volume.diff()
+
+@register_indicator('Ichimoku', outputs=['Tenkan_Sen', 'Kijun_Sen', 'Senkou_Span_A', 'Senkou_Span_B'],
+                    params={'tenkan': 9, 'kijun': 26, 'senkou': 52}, inputs=lambda p: {'high': 'Yüksek', 'low': 'Düşük'})
+def calculate_ichimoku(high, low, tenkan, kijun, senkou):
+    tenkan_sen = (high.rolling(tenkan).max() + low.rolling(tenkan).min()) / 2
+    kijun_sen = (high.rolling(kijun).max() + low.rolling(kijun).min()) / 2
+    senkou_span_a = (tenkan_sen + kijun_sen) / 2
+    senkou_span_b = (high.rolling(senkou).max() + low.rolling(senkou).min()) / 2
+    return tenkan_sen, kijun_sen, senkou_span_a, senkou_span_b
+
+# Tüm bölümler açıkken hesaplanan varsayılan gösterge kümesi (tarayıcı, backtest ve dışa aktarma bu sütunları kullanır)
+DEFAULT_INDICATORS = [
+    ('MA', {'window': 20}),
+    ('MA', {'window': 50}),
+    ('MA', {'window': 200}),
+    ('RSI', {}),
+    ('Bollinger', {}),
+    ('MACD', {}),
+    ('Hacim_Fark', {}),
+    ('Ichimoku', {})
+]
+
+
+###########################
+# Bağımlılık Grafiği ve Hesaplama
+###########################
+class IndicatorCache:
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+def indicator_node(name, params=None):
+    if name not in INDICATORS:
+        raise ValueError(f"Bilinmeyen gösterge: {name}")
+    defaults = INDICATORS[name]['params']
+    unknown = set(params or {}) - set(defaults)
+    if unknown:
+        raise ValueError(f"{name} için bilinmeyen parametre: {', '.join(sorted(unknown))}")
+    params = {**defaults, **(params or {})}
+    error = INDICATORS[name]['validate'](params)
+    if error:
+        raise ValueError(error)
+    return name, tuple(sorted(params.items()))
+
+def indicator_columns(node):
+    name, params = node
+    return [column.format(**dict(params)) for column in INDICATORS[name]['outputs']]
+
+def resolve_indicators(requests):
+    # Derinlik öncelikli gezinti: her düğüm girdilerinden sonra sıralanır, ortak düğümler bir kez yer alır
+    order = []
+    visiting = set()
+
+    def visit(node):
+        if node in order:
+            return
+        if node in visiting:
+            raise ValueError(f"Döngüsel gösterge bağımlılığı: {node[0]}")
+        visiting.add(node)
+        for source in INDICATORS[node[0]]['inputs'](dict(node[1])).values():
+            if isinstance(source, tuple):
+                visit(indicator_node(*source))
+        visiting.discard(node)
+        order.append(node)
+
+    targets = []
+    producers = {}
+    for request in requests:
+        node = indicator_node(request) if isinstance(request, str) else indicator_node(*request)
+        if node in targets:
+            continue
+        # Çıktı adları parametre içermeyen göstergeler (ör. RSI) farklı parametrelerle birbirinin sütununu ezmesin
+        for column in indicator_columns(node):
+            if column in producers:
+                raise ValueError(f"{column} sütunu birden fazla gösterge isteğinden üretiliyor: {producers[column]}, {dict(node[1])}")
+            producers[column] = dict(node[1])
+        targets.append(node)
+        visit(node)
+    return targets, order
+
+def compute_indicators(data_new, requests=None, cache=None):
+    targets, order = resolve_indicators(DEFAULT_INDICATORS if requests is None else requests)
+    # Önbellek anahtarı fiyat verisinin özetini içerir; veri güncellenince eski sonuçlar kullanılmaz
+    fingerprint = int(pd.util.hash_pandas_object(data_new, index=False).sum()) if cache is not None else None
+
+    results = {}
+    for node in order:
+        result = cache.get((fingerprint, node)) if cache is not None else None
+        if result is None:
+            name, params = node
+            spec = INDICATORS[name]
+            kwargs = {
+                argument: results[indicator_node(*source)] if isinstance(source, tuple) else data_new[source]
+                for argument, source in spec['inputs'](dict(params)).items()
+            }
+            result = spec['func'](**kwargs, **dict(params))
+            if cache is not None:
+                cache.put((fingerprint, node), result)
+        results[node] = result
+
+    data_new = data_new.copy()
+    for node in targets:
+        outputs = results[node] if isinstance(results[node], tuple) else (results[node],)
+        for column, values in zip(indicator_columns(node), outputs):
+            data_new[column] = values
+    return data_new
+
+
+###########################
+# Fibonacci Seviyeleri
+###########################
+FIBONACCI_LEVELS = [0, 0.236, 0.382, 0.5, 0.618, 0.786, 1]
+
+def calculate_fibonacci_levels(data, levels=FIBONACCI_LEVELS):
+    low_price = data['Kapanış'].min()
+    high_price = data['Kapanış'].max()
+    diff = high_price - low_price
+    return [high_price - level * diff for level in levels]
+
+
+###########################
+# Gösterge Tablosu
+###########################
+def prepare_price_frame(data):
+    data = data.reset_index()
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+    data_new = data[['Date', 'Close', 'Volume', 'High', 'Low']].copy()
+    data_new.columns = ['Tarih', 'Kapanış', 'Hacim', 'Yüksek', 'Düşük']
+    data_new['Tarih'] = pd.to_datetime(data_new['Tarih'])
+    return data_new
+
+def split_price_frames(data, tickers):
+    if data.empty:
+        return {}
+    available = set(data.columns.get_level_values(1))
+    frames = {}
+    for ticker in tickers:
+        if ticker in available:
+            price_frame = prepare_price_frame(data.xs(ticker, axis=1, level=1)).dropna(subset=['Kapanış'])
+            if not price_frame.empty:
+                frames[ticker] = price_frame
+    return frames
+
+def build_indicator_frame(data_new, indicators=None, cache=None):
+    return compute_indicators(data_new, indicators, cache)
+
+def find_crosses(data_new, fast='MA50', slow='MA200'):
+    fast_now, slow_now = data_new[fast], data_new[slow]
+    fast_prev, slow_prev = fast_now.shift(1), slow_now.shift(1)
+    valid = fast_now.notna() & slow_now.notna() & fast_prev.notna() & slow_prev.notna()
+    golden = valid & (fast_now > slow_now) & (fast_prev <= slow_prev)
+    death = valid & (fast_now < slow_now) & (fast_prev >= slow_prev)
+    columns = ['Tarih', 'Kapanış']
+    return data_new.loc[golden, columns], data_new.loc[death, columns]
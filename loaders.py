@@ -0,0 +1,137 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import streamlit as st
+
+from fetcher import INTERACTIVE, SymbolNotFoundError, get_scheduler
+from forecasting import FORECAST_PERIODS, fit_forecast
+from indicators import IndicatorCache, build_indicator_frame, prepare_price_frame
+
+DEFAULT_START = date(2020, 1, 1)
+
+# Fiyat kayıtları bir sonraki BIST kapanışına kadar geçerlidir (bitiş tarihi hariç tutulduğundan gün içinde değişmezler);
+# PRICE_TTL yalnızca üst sınırdır
+MARKET_TIMEZONE = ZoneInfo('Europe/Istanbul')
+MARKET_CLOSE = time(18, 10)
+PRICE_TTL = 24 * 3600
+FORECAST_TTL = 12 * 3600
+FUNDAMENTALS_TTL = 24 * 3600
+
+FUNDAMENTAL_ATTRS = ('info', 'balance_sheet', 'financials', 'cashflow')
+FUNDAMENTALS_TIMEOUT = 60
+PEER_CONCURRENCY = 8
+
+# Gösterge düğümleri (fiyat verisi + gösterge + parametreler) tüm oturumlar arasında paylaşılır
+INDICATOR_CACHE = IndicatorCache()
+# Karşılaştırma kapanışları sembol bazında tutulur; sembol kümesi değişince yalnızca yeni semboller indirilir.
+# Veri dönmeyen semboller boş seri olarak kaydedilir ve oturum boyunca yeniden indirilmez
+CLOSE_CACHE = IndicatorCache(max_entries=2048)
+NO_CLOSES = pd.Series(dtype=float)
+
+BENCHMARK_ASSETS = {
+    'BIST100': 'XU100.IS',
+    'Dolar': 'TRY=X',
+    'Euro': 'EURTRY=X',
+    'Altın': 'GC=F',
+    'Gümüş': 'SI=F',
+    'Bitcoin': 'BTC-USD'
+}
+
+
+###########################
+# Önbellekli Yükleyiciler
+###########################
+# "_priority" parametresi önbellek anahtarına girmez; arka plan ısıtması ile kullanıcı isteği aynı kaydı paylaşır
+
+def next_market_close(now=None):
+    now = now or datetime.now(MARKET_TIMEZONE)
+    close = datetime.combine(now.date(), MARKET_CLOSE, tzinfo=MARKET_TIMEZONE)
+    if now >= close:
+        close += timedelta(days=1)
+    while close.weekday() >= 5:
+        close += timedelta(days=1)
+    return close
+
+# "session" önbellek anahtarına girer; kapanış geçince kayıtlar yeniden indirilir
+@st.cache_data(ttl=PRICE_TTL, show_spinner=False)
+def _load_price_history(ticker, start, end, session, _priority=INTERACTIVE):
+    # Boş sonuç önbelleğe alınmaz; bir sonraki istek yeniden indirir
+    try:
+        return get_scheduler().download(ticker, start=start, end=end, priority=_priority)
+    except SymbolNotFoundError as e:
+        raise LookupError(f"{ticker} için veri bulunamadı") from e
+
+@st.cache_data(ttl=PRICE_TTL, show_spinner=False)
+def _load_price_frame(ticker, start, end, session, _priority=INTERACTIVE):
+    return prepare_price_frame(_load_price_history(ticker, start, end, session, _priority))
+
+def load_price_history(ticker, start, end, _priority=INTERACTIVE):
+    return _load_price_history(ticker, start, end, next_market_close(), _priority)
+
+def load_price_frame(ticker, start, end, _priority=INTERACTIVE):
+    return _load_price_frame(ticker, start, end, next_market_close(), _priority)
+
+def load_indicator_frame(ticker, start, end, indicators=None, _priority=INTERACTIVE):
+    # Yalnızca istenen göstergeler ve bağımlılıkları hesaplanır; önceden hesaplanmış düğümler önbellekten gelir
+    data_new = load_price_frame(ticker, start, end, _priority)
+    return build_indicator_frame(data_new, indicators, cache=INDICATOR_CACHE)
+
+@st.cache_data(ttl=FORECAST_TTL, show_spinner=False)
+def load_forecast(ticker, start, end, periods=FORECAST_PERIODS, _priority=INTERACTIVE):
+    data_new = load_price_frame(ticker, start, end, _priority)
+    return fit_forecast(data_new, periods)
+
+@st.cache_data(ttl=FUNDAMENTALS_TTL, show_spinner=False)
+def load_fundamentals(ticker, _priority=INTERACTIVE):
+    return get_scheduler().ticker_attrs(ticker, FUNDAMENTAL_ATTRS, priority=_priority, timeout=FUNDAMENTALS_TIMEOUT)
+
+def load_peer_fundamentals(tickers, _priority=INTERACTIVE):
+    # Her hisse kendi önbellek kaydını kullanır; hata veren hisseler karşılaştırmanın geri kalanını engellemez
+    def load(ticker):
+        try:
+            return ticker, load_fundamentals(ticker, _priority)
+        except Exception:
+            return ticker, None
+
+    with ThreadPoolExecutor(max_workers=PEER_CONCURRENCY, thread_name_prefix='peer-fundamentals') as executor:
+        return {ticker: fundamentals for ticker, fundamentals in executor.map(load, tickers) if fundamentals is not None}
+
+def load_close_prices(symbols, start, end, _priority=INTERACTIVE):
+    session = next_market_close()
+    closes = {symbol: CLOSE_CACHE.get((symbol, start, end, session)) for symbol in symbols}
+    pending = [symbol for symbol, series in closes.items() if series is None]
+    if pending:
+        try:
+            data = get_scheduler().download(pending, start=start, end=end, priority=_priority)
+        except SymbolNotFoundError:
+            data = pd.DataFrame()
+        downloaded = data['Close'] if not data.empty else pd.DataFrame()
+        if isinstance(downloaded, pd.Series):
+            downloaded = downloaded.to_frame(pending[0])
+        for symbol in pending:
+            found = symbol in downloaded.columns and downloaded[symbol].notna().any()
+            closes[symbol] = downloaded[symbol].rename(symbol) if found else NO_CLOSES
+            CLOSE_CACHE.put((symbol, start, end, session), closes[symbol])
+    missing = [symbol for symbol, series in closes.items() if series.empty]
+    if len(missing) == len(closes):
+        raise SymbolNotFoundError(missing)
+    return pd.DataFrame({symbol: series for symbol, series in closes.items() if not series.empty})
+
+def get_comparison_closes(ticker, extra_symbols=(), _priority=INTERACTIVE):
+    end_date = datetime.today().date()
+    start_date = (pd.Timestamp(end_date) - pd.DateOffset(years=1)).date()
+
+    assets = dict(BENCHMARK_ASSETS)
+    for symbol in extra_symbols:
+        # Karşılaştırmada zaten olan bir sembol (ör. XU100.IS) kıyas sütununun adını ezmesin
+        if symbol not in assets.values():
+            assets[symbol] = symbol
+    assets['Hisse'] = ticker
+
+    symbols = list(dict.fromkeys(assets.values()))
+    closes = load_close_prices(symbols, start_date, end_date, _priority)
+    missing = [symbol for symbol in symbols if symbol not in closes.columns]
+    # Analiz edilen hisse bir kıyas varlığıyla aynıysa her iki ad da aynı seriyi alır
+    return pd.DataFrame({name: closes[symbol] for name, symbol in assets.items() if symbol in closes.columns}), missing
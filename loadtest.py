@@ -0,0 +1,152 @@
+import argparse
+import json
+import os
+import pickle
+import resource
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import fake_provider
+from fake_provider import FakeProvider
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+# app.py'nin oturum başına tuttuğu durum
+SESSION_KEYS = ('data', 'analysis', 'bist100_value', 'bankacilik_value', 'btc_value')
+
+
+###########################
+# Simüle Kullanıcı Oturumu
+###########################
+def pick_symbols(count, universe_size, seed=0, zipf=1.2):
+    # Gerçek kullanım gibi az sayıda popüler sembol oturumların çoğunu oluşturur
+    rng = np.random.default_rng(seed)
+    universe = [f"SIM{i:03d}.IS" for i in range(universe_size)]
+    weights = 1 / np.arange(1, universe_size + 1) ** zipf
+    return list(rng.choice(universe, size=count, p=weights / weights.sum()))
+
+def _session_state_bytes(at):
+    state = {key: at.session_state[key] for key in SESSION_KEYS if key in at.session_state}
+    try:
+        return len(pickle.dumps(state))
+    except Exception:
+        data = state.get('data')
+        return int(data.memory_usage(deep=True).sum()) if data is not None else 0
+
+def run_session(symbol, timeout=300):
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    started = time.perf_counter()
+    at.run()
+    page_load = time.perf_counter() - started
+
+    next(w for w in at.sidebar.text_input if w.label == "Hisse Senedi Sembolü").set_value(symbol)
+    next(b for b in at.sidebar.button if b.label == "Analizi Başlat").click()
+    started = time.perf_counter()
+    at.run()
+    analysis = time.perf_counter() - started
+
+    errors = [str(e.value) for e in at.exception] + [str(e.value) for e in at.error]
+    # Veri alınamayan bölümler hata değil uyarı olarak gösterilir; bu oturumlar ayrıca "bozulmuş" sayılır
+    warnings = [str(w.value) for w in at.warning]
+    if any('Veri alınamadı' in str(m.value) for m in at.markdown):
+        warnings.append('Başlık fiyatları alınamadı')
+    return {
+        'symbol': symbol,
+        'page_load_s': page_load,
+        'analysis_s': analysis,
+        'state_bytes': _session_state_bytes(at),
+        'errors': errors,
+        'warnings': warnings
+    }
+
+
+###########################
+# Yük Testi
+###########################
+def _percentiles(values):
+    if not len(values):
+        return {}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {'p50': round(p50, 1), 'p95': round(p95, 1), 'p99': round(p99, 1), 'max': round(float(np.max(values)), 1)}
+
+def _rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_load_test(users=20, sessions=100, universe_size=20, latency=0.05, failure_rate=0.0, max_calls_per_second=None,
+                  seed=0, cold=True, timeout=300, scheduler_options=None):
+    provider = FakeProvider(max_calls_per_second=max_calls_per_second, seed=seed, latency=latency, failure_rate=failure_rate)
+    scheduler = fake_provider.install(provider, **(scheduler_options or {}))
+    if cold:
+        st.cache_data.clear()
+
+    symbols = pick_symbols(sessions, universe_size, seed)
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users, thread_name_prefix='sim-user') as executor:
+        results = list(executor.map(lambda symbol: run_session(symbol, timeout), symbols))
+    duration = time.perf_counter() - started
+
+    page_loads = np.array([r['page_load_s'] for r in results]) * 1000
+    analyses = np.array([r['analysis_s'] for r in results]) * 1000
+    state_kb = np.array([r['state_bytes'] for r in results]) / 1024
+    failed = [r for r in results if r['errors']]
+    degraded = [r for r in results if r['warnings'] and not r['errors']]
+    return {
+        'sessions': sessions,
+        'users': users,
+        'unique_symbols': len(set(symbols)),
+        'duration_s': round(duration, 2),
+        'throughput_sessions_per_s': round(sessions / duration, 2),
+        'page_load_ms': _percentiles(page_loads),
+        'analysis_render_ms': _percentiles(analyses),
+        'session_state_kb': {'p50': round(float(np.median(state_kb)), 1), 'max': round(float(state_kb.max()), 1)},
+        'rss_growth_mb': round(_rss_mb() - rss_before, 1),
+        'sessions_with_errors': len(failed),
+        'sample_errors': sorted({error for r in failed for error in r['errors']})[:5],
+        'sessions_degraded': len(degraded),
+        'sample_warnings': sorted({warning for r in degraded for warning in r['warnings']})[:5],
+        'upstream_calls': dict(provider.calls),
+        'scheduler': scheduler.metrics()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sahte veri sağlayıcı ile çok kullanıcılı yük testi")
+    parser.add_argument('--users', type=int, default=20, help="Eşzamanlı simüle kullanıcı sayısı")
+    parser.add_argument('--sessions', type=int, default=100, help="Toplam oturum sayısı")
+    parser.add_argument('--symbols', type=int, default=20, help="Oturumların seçtiği sembol evreni")
+    parser.add_argument('--latency', type=float, default=0.05, help="Sağlayıcı çağrısı başına gecikme (sn)")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Çağrı başına geçici hata olasılığı")
+    parser.add_argument('--throttle', type=int, default=None, help="Sağlayıcının saniyede kabul ettiği en fazla çağrı")
+    parser.add_argument('--max-retries', type=int, default=None, help="Planlayıcının yeniden deneme sayısı (0: hatalar doğrudan görünür)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--warm', action='store_true', help="Önbellekleri temizlemeden başla")
+    parser.add_argument('--json', help="Raporu JSON olarak bu dosyaya yaz")
+    args = parser.parse_args()
+
+    # Test oturumları gerçek kullanım istatistiklerini ve dışa aktarma dizinini kirletmesin
+    workdir = tempfile.mkdtemp(prefix='hisse-loadtest-')
+    os.environ.setdefault('HISSE_USAGE_FILE', os.path.join(workdir, 'usage.json'))
+    os.environ.setdefault('HISSE_EXPORT_DIR', os.path.join(workdir, 'exports'))
+
+    scheduler_options = {'max_retries': args.max_retries} if args.max_retries is not None else None
+    report = run_load_test(args.users, args.sessions, args.symbols, args.latency, args.failure_rate, args.throttle, args.seed,
+                           cold=not args.warm, scheduler_options=scheduler_options)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+import ast
+import operator
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from export import EXPORT_DIR
+from fetcher import INTERACTIVE, get_scheduler
+from indicators import build_indicator_frame, find_crosses, split_price_frames
+
+SCREENER_DIR = os.environ.get('HISSE_SCREENER_DIR', os.path.join(EXPORT_DIR, 'screener'))
+SCREENER_UNIVERSE_FILE = os.environ.get('HISSE_SCREENER_UNIVERSE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'screener_universe.txt'))
+
+# MA200 ve 52 günlük Ichimoku için yeterli geçmiş; kesişim sayaçları bu pencerenin dışına taşınır
+TAIL_BARS = 300
+INITIAL_HISTORY_DAYS = 450
+DOWNLOAD_BATCH = 100
+
+PRICE_COLUMNS = ['Tarih', 'Kapanış', 'Hacim', 'Yüksek', 'Düşük']
+
+EXAMPLE_QUERIES = {
+    'Aşırı satım + bulut üstü + son 20 günde Golden Cross': 'RSI < 30 and Bulut_Üstü and Golden_Cross_Gün <= 20',
+    'Aşırı alım': 'RSI > 70',
+    'Alt Bollinger bandının altında': 'Kapanış < BB_Lower',
+    'MACD pozitif kesişim, MA50 üzerinde': 'MACD > MACD_Signal and Kapanış > MA50',
+    'Son 5 günde Death Cross': 'Death_Cross_Gün <= 5'
+}
+
+# Sorgular pandas'a verilmeden önce ayrıştırılır; yalnızca sütun adları, sabitler, karşılaştırmalar ve and/or/not kabul edilir
+COMPARISONS = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne
+}
+
+
+def load_universe(path=SCREENER_UNIVERSE_FILE):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    except OSError:
+        from warmer import WARM_TICKERS
+        return list(WARM_TICKERS)
+
+
+###########################
+# Son Durum Satırı
+###########################
+def _bars_since(events, data_new):
+    if events.empty:
+        return np.nan
+    return len(data_new) - 1 - data_new.index.get_loc(events.index[-1])
+
+def latest_state(data_new, previous=None, new_bars=0):
+    last = data_new.iloc[-1]
+    state = {column: last[column] for column in data_new.columns}
+    cloud_top = max(last['Senkou_Span_A'], last['Senkou_Span_B'])
+    cloud_bottom = min(last['Senkou_Span_A'], last['Senkou_Span_B'])
+    state['Bulut_Üstü'] = bool(last['Kapanış'] > cloud_top)
+    state['Bulut_Altı'] = bool(last['Kapanış'] < cloud_bottom)
+    state['Değişim_1G'] = (data_new['Kapanış'].iloc[-1] / data_new['Kapanış'].iloc[-2] - 1) * 100 if len(data_new) > 1 else np.nan
+
+    golden_crosses, death_crosses = find_crosses(data_new)
+    for name, events in (('Golden_Cross', golden_crosses), ('Death_Cross', death_crosses)):
+        bars = _bars_since(events, data_new)
+        if np.isnan(bars) and previous is not None and pd.notna(previous.get(f'{name}_Gün')):
+            # Kesişim pencere dışında kaldıysa sayaç önceki değerden devam eder
+            bars = previous[f'{name}_Gün'] + new_bars
+        state[f'{name}_Gün'] = bars
+        state[f'Son_{name}'] = events['Tarih'].iloc[-1] if not events.empty else (previous.get(f'Son_{name}') if previous is not None else pd.NaT)
+    return state
+
+
+###########################
+# Tarama Endeksi
+###########################
+class ScreenerIndex:
+    def __init__(self, root=SCREENER_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self.index = self._read('index.parquet').set_index('Hisse') if self._exists('index.parquet') else pd.DataFrame()
+        self._states = self.index.to_dict('index')
+        bars = self._read('bars.parquet') if self._exists('bars.parquet') else pd.DataFrame(columns=['Hisse'] + PRICE_COLUMNS)
+        self._tails = {ticker: frame.drop(columns='Hisse').reset_index(drop=True) for ticker, frame in bars.groupby('Hisse')}
+
+    def _exists(self, name):
+        return os.path.exists(os.path.join(self.root, name))
+
+    def _read(self, name):
+        return pd.read_parquet(os.path.join(self.root, name))
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock:
+            bars = pd.concat([tail.assign(Hisse=ticker) for ticker, tail in self._tails.items()], ignore_index=True) if self._tails else pd.DataFrame(columns=['Hisse'] + PRICE_COLUMNS)
+            self.index.reset_index().to_parquet(os.path.join(self.root, 'index.parquet'), index=False)
+            bars.to_parquet(os.path.join(self.root, 'bars.parquet'), index=False)
+
+    def last_dates(self):
+        with self._lock:
+            return {ticker: state['Tarih'] for ticker, state in self._states.items()}
+
+    def ingest(self, ticker, price_frame, refresh=True):
+        price_frame = price_frame[PRICE_COLUMNS].dropna(subset=['Kapanış'])
+        with self._lock:
+            previous_bars = self._tails.get(ticker)
+            last_date = previous_bars['Tarih'].max() if previous_bars is not None else None
+            if last_date is not None:
+                # Son bar gün içinde kısmi indirilmiş olabilir; aynı tarihli bar yenisiyle değiştirilir
+                price_frame = price_frame[price_frame['Tarih'] >= last_date]
+                unchanged = len(price_frame) == 1 and price_frame['Tarih'].iloc[0] == last_date and np.allclose(
+                    price_frame[PRICE_COLUMNS[1:]].to_numpy(dtype=float),
+                    previous_bars[PRICE_COLUMNS[1:]].tail(1).to_numpy(dtype=float),
+                    equal_nan=True
+                )
+                if unchanged:
+                    return False
+                if not price_frame.empty:
+                    previous_bars = previous_bars[previous_bars['Tarih'] < price_frame['Tarih'].min()]
+            if price_frame.empty:
+                return False
+            new_bars = int((price_frame['Tarih'] > last_date).sum()) if last_date is not None else len(price_frame)
+
+            tail = pd.concat([previous_bars, price_frame], ignore_index=True) if previous_bars is not None else price_frame
+            tail = tail.sort_values('Tarih').tail(TAIL_BARS).reset_index(drop=True)
+            self._tails[ticker] = tail
+            self._states[ticker] = latest_state(build_indicator_frame(tail), self._states.get(ticker), new_bars)
+            if refresh:
+                self._refresh_index()
+            return True
+
+    def _refresh_index(self):
+        self.index = pd.DataFrame.from_dict(self._states, orient='index').rename_axis('Hisse')
+
+    def update(self, tickers, priority=INTERACTIVE):
+        scheduler = get_scheduler()
+        last_dates = self.last_dates()
+        today = pd.Timestamp.today().normalize()
+        updated = []
+
+        # Son tarihi aynı olan semboller tek istekte, yalnızca son bardan itibaren indirilir
+        groups = {}
+        for ticker in tickers:
+            start = last_dates.get(ticker, today - pd.Timedelta(days=INITIAL_HISTORY_DAYS))
+            groups.setdefault(start, []).append(ticker)
+
+        for start, group in groups.items():
+            for i in range(0, len(group), DOWNLOAD_BATCH):
+                batch = group[i:i + DOWNLOAD_BATCH]
+                data = scheduler.download(batch, start=start.date(), end=(today + pd.Timedelta(days=1)).date(), priority=priority)
+                for ticker, price_frame in split_price_frames(data, batch).items():
+                    if self.ingest(ticker, price_frame, refresh=False):
+                        updated.append(ticker)
+        if updated:
+            with self._lock:
+                self._refresh_index()
+            self.save()
+        return updated
+
+    def query(self, expression):
+        with self._lock:
+            index = self.index
+        node = _parse_query(expression)
+        if index.empty:
+            return index
+        mask = _evaluate(node, index)
+        if not isinstance(mask, pd.Series):
+            mask = pd.Series(mask, index=index.index)
+        return index[_as_mask(mask)]
+
+
+###########################
+# Sorgu Ayrıştırma
+###########################
+def _parse_query(expression):
+    try:
+        return ast.parse(expression.strip(), mode='eval').body
+    except SyntaxError as e:
+        raise ValueError(f"Sorgu ayrıştırılamadı: {e.msg}") from None
+
+def _as_mask(value):
+    # Çıplak sütun adları (ör. Bulut_Üstü) koşul olarak kullanılır; eksik değerler sağlanmamış sayılır
+    if isinstance(value, pd.Series):
+        return value.fillna(False).astype(bool)
+    return bool(value)
+
+def _evaluate(node, index):
+    if isinstance(node, ast.BoolOp):
+        values = [_as_mask(_evaluate(value, index)) for value in node.values]
+        combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+        result = values[0]
+        for value in values[1:]:
+            result = combine(result, value)
+        return result
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        value = _as_mask(_evaluate(node.operand, index))
+        return ~value if isinstance(value, pd.Series) else not value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)) and isinstance(node.operand, ast.Constant):
+        value = _evaluate(node.operand, index)
+        return -value if isinstance(node.op, ast.USub) else value
+    if isinstance(node, ast.Compare):
+        result = True
+        left = _evaluate(node.left, index)
+        for op, comparator in zip(node.ops, node.comparators):
+            if type(op) not in COMPARISONS:
+                raise ValueError(f"İzin verilmeyen karşılaştırma: {type(op).__name__}")
+            right = _evaluate(comparator, index)
+            result = operator.and_(COMPARISONS[type(op)](left, right), result)
+            left = right
+        return result
+    if isinstance(node, ast.Name):
+        if node.id not in index.columns:
+            raise ValueError(f"Bilinmeyen sütun: {node.id}")
+        return index[node.id]
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str, bool)):
+        return node.value
+    raise ValueError(f"Sorguda izin verilmeyen ifade: {ast.unparse(node)}")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modüller app.py ile aynı dizinde düz olarak durur
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from backtest import TRADING_DAYS, run_backtest
+
+
+def test_always_long_matches_buy_and_hold_minus_entry_cost():
+    close = np.array([100.0, 110.0, 99.0, 121.0])
+    equity, metrics = run_backtest(close, np.ones(len(close)), cost=0.001)
+
+    # Pozisyon ilk sinyalden sonraki bardan itibaren taşınır; giriş maliyeti o bardan düşülür
+    expected = (1 + 0.10 - 0.001) * (1 - 0.10) * (121 / 99)
+    assert equity[-1, 0] == pytest.approx(expected)
+    assert metrics['Toplam Getiri (%)'].iloc[0] == pytest.approx((expected - 1) * 100)
+    assert metrics['İşlem Sayısı'].iloc[0] == 1
+    assert metrics['Piyasada Kalma (%)'].iloc[0] == pytest.approx(75.0)
+    assert metrics['Maks. Düşüş (%)'].iloc[0] == pytest.approx(-10.0)
+
+def test_trade_losing_after_exit_cost_is_not_a_win():
+    close = np.array([100.0, 100.0, 100.05, 100.05, 100.05])
+    _, metrics = run_backtest(close, np.array([1.0, 1.0, 0.0, 0.0, 0.0]), cost=0.001)
+
+    assert metrics['Toplam Getiri (%)'].iloc[0] < 0
+    assert metrics['İşlem Sayısı'].iloc[0] == 1
+    assert metrics['İsabet Oranı (%)'].iloc[0] == 0
+
+def test_trades_and_hit_rate_per_strategy_column():
+    close = np.array([100.0, 100.0, 110.0, 110.0, 110.0, 100.0, 100.0, 95.0, 95.0])
+    positions = np.column_stack([
+        [1, 1, 0, 0, 1, 1, 0, 0, 0],   # bir kazanan, bir kaybeden işlem
+        np.zeros(len(close))           # hiç işlem yok
+    ]).astype(float)
+    equity, metrics = run_backtest(close, positions, cost=0.0)
+
+    assert list(metrics['İşlem Sayısı']) == [2, 0]
+    assert metrics['İsabet Oranı (%)'].iloc[0] == pytest.approx(50.0)
+    assert np.isnan(metrics['İsabet Oranı (%)'].iloc[1])
+    assert np.allclose(equity[:, 1], 1.0)
+    assert np.isnan(metrics['Sharpe'].iloc[1])
+
+def test_annualized_return_uses_trading_days():
+    close = 100 * 1.001 ** np.arange(TRADING_DAYS)
+    _, metrics = run_backtest(close, np.ones(len(close)), cost=0.0)
+    total = metrics['Toplam Getiri (%)'].iloc[0]
+    assert metrics['Yıllık Getiri (%)'].iloc[0] == pytest.approx(total)
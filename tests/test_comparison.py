@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import fetcher
+import loaders
+from comparison import compare_assets
+from fake_provider import FakeProvider
+from fetcher import FetchScheduler, SymbolNotFoundError
+from indicators import IndicatorCache
+
+
+def synthetic_closes():
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range('2024-01-01', periods=200)
+    market = rng.normal(0, 0.01, len(dates))
+    returns = {
+        'BIST100': market,
+        'Kaldıraçlı': 2 * market,
+        'Ters': -market,
+        'Bağımsız': rng.normal(0, 0.01, len(dates))
+    }
+    return pd.DataFrame({name: 100 * np.cumprod(1 + r) for name, r in returns.items()}, index=dates)
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    provider = FakeProvider(unknown_symbols={'YOK.IS'})
+    monkeypatch.setattr(fetcher, '_scheduler', FetchScheduler(provider=provider, rate=1000, burst=1000, base_delay=0.01))
+    monkeypatch.setattr(loaders, 'CLOSE_CACHE', IndicatorCache())
+    return provider
+
+
+def test_compare_assets_beta_and_correlation():
+    summary, correlation = compare_assets(synthetic_closes(), benchmark='BIST100', window=60)
+
+    assert summary.loc['BIST100', 'Beta'] == pytest.approx(1.0)
+    assert summary.loc['Kaldıraçlı', 'Beta'] == pytest.approx(2.0)
+    assert summary.loc['Ters', 'Beta'] == pytest.approx(-1.0)
+    assert correlation.loc['Kaldıraçlı', 'BIST100'] == pytest.approx(1.0)
+    assert correlation.loc['Ters', 'BIST100'] == pytest.approx(-1.0)
+    assert abs(correlation.loc['Bağımsız', 'BIST100']) < 0.5
+    assert np.allclose(correlation.to_numpy(), correlation.to_numpy().T)
+
+def test_compare_assets_matches_pandas_reference():
+    closes = synthetic_closes()
+    summary, correlation = compare_assets(closes, benchmark='BIST100', window=60, return_windows=(20,))
+
+    recent = closes.pct_change().iloc[-60:]
+    assert np.allclose(correlation.to_numpy(), recent.corr().to_numpy())
+    expected_beta = recent.cov()['BIST100'] / recent['BIST100'].var()
+    assert np.allclose(summary['Beta'].to_numpy(), expected_beta.to_numpy())
+    assert np.allclose(summary['20G Getiri (%)'].to_numpy(), (closes.iloc[-1] / closes.iloc[-21] - 1).to_numpy() * 100)
+    assert np.allclose(summary['Getiri (%)'].to_numpy(), (closes.iloc[-1] / closes.iloc[0] - 1).to_numpy() * 100)
+
+def test_compare_assets_without_benchmark_has_no_beta():
+    summary, _ = compare_assets(synthetic_closes().drop(columns='BIST100'), benchmark='BIST100')
+    assert summary['Beta'].isna().all()
+
+def test_missing_symbols_are_cached_for_the_session(scheduler):
+    start, end = pd.Timestamp('2024-01-01').date(), pd.Timestamp('2024-06-01').date()
+
+    closes = loaders.load_close_prices(['SIM000.IS', 'YOK.IS'], start, end)
+    assert list(closes.columns) == ['SIM000.IS']
+    assert scheduler.calls['download'] == 1
+
+    closes = loaders.load_close_prices(['SIM000.IS', 'YOK.IS'], start, end)
+    assert list(closes.columns) == ['SIM000.IS']
+    assert scheduler.calls['download'] == 1
+
+def test_only_missing_symbols_raise_and_stay_cached(scheduler):
+    start, end = pd.Timestamp('2024-01-01').date(), pd.Timestamp('2024-06-01').date()
+    loaders.load_close_prices(['SIM000.IS'], start, end)
+    calls = scheduler.calls['download']
+
+    # Eksik sembolün indirmesi başarısız olsa da önbellekteki seriyle çerçeve kurulur
+    assert list(loaders.load_close_prices(['SIM000.IS', 'YOK.IS'], start, end).columns) == ['SIM000.IS']
+    with pytest.raises(SymbolNotFoundError) as error:
+        loaders.load_close_prices(['YOK.IS'], start, end)
+    assert error.value.missing == ['YOK.IS']
+    # Yalnızca ilk eksik istek sağlayıcıya gider (NOT_FOUND_RETRIES kadar tekrarla)
+    assert scheduler.calls['download'] == calls + 1 + fetcher.NOT_FOUND_RETRIES
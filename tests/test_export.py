@@ -0,0 +1,55 @@
+import pandas as pd
+
+from export import export_analysis, list_exports, read_analysis
+from fake_provider import FakeProvider
+from indicators import build_indicator_frame, find_crosses, prepare_price_frame
+
+
+def indicator_frame(symbol, start, end):
+    return build_indicator_frame(prepare_price_frame(FakeProvider().download(symbol, start=start, end=end)))
+
+
+def test_export_round_trip(tmp_path):
+    data_new = indicator_frame('AAA.IS', '2019-01-01', '2025-01-01')
+    written = export_analysis('AAA.IS', data_new, root=tmp_path)
+
+    indicators = read_analysis('indicators', 'AAA.IS', root=tmp_path)
+    assert written['indicators'] == len(data_new) == len(indicators)
+    pd.testing.assert_frame_equal(
+        indicators.drop(columns=['ticker', 'year']).sort_values('Tarih').reset_index(drop=True),
+        data_new.reset_index(drop=True),
+        check_dtype=False
+    )
+
+    golden_crosses, death_crosses = find_crosses(data_new)
+    assert len(read_analysis('crosses', 'AAA.IS', root=tmp_path)) == len(golden_crosses) + len(death_crosses)
+    assert len(read_analysis('fibonacci', 'AAA.IS', root=tmp_path)) == 7
+
+def test_read_filters_by_ticker_date_and_columns(tmp_path):
+    for symbol in ('AAA.IS', 'BBB.IS'):
+        export_analysis(symbol, indicator_frame(symbol, '2020-01-01', '2025-01-01'), root=tmp_path)
+
+    subset = read_analysis('indicators', ['BBB.IS'], start='2022-03-01', end='2022-06-30', columns=['Kapanış'], root=tmp_path)
+    assert set(subset['ticker']) == {'BBB.IS'}
+    assert subset['Tarih'].min() >= pd.Timestamp('2022-03-01')
+    assert subset['Tarih'].max() <= pd.Timestamp('2022-06-30')
+    assert list(subset.columns) == ['ticker', 'Tarih', 'Kapanış']
+
+def test_reexport_replaces_previous_ticker_data(tmp_path):
+    export_analysis('AAA.IS', indicator_frame('AAA.IS', '2019-01-01', '2025-01-01'), root=tmp_path)
+    shorter = indicator_frame('AAA.IS', '2023-01-01', '2025-01-01')
+    export_analysis('AAA.IS', shorter, root=tmp_path)
+
+    indicators = read_analysis('indicators', 'AAA.IS', root=tmp_path)
+    assert len(indicators) == len(shorter)
+    assert indicators['Tarih'].min() == shorter['Tarih'].min()
+    crosses = read_analysis('crosses', 'AAA.IS', root=tmp_path)
+    assert crosses.empty or crosses['Tarih'].min() >= shorter['Tarih'].min()
+
+def test_symbols_with_special_characters(tmp_path):
+    data_new = indicator_frame('GC=F', '2023-01-01', '2025-01-01')
+    export_analysis('GC=F', data_new, root=tmp_path)
+    export_analysis('GC=F', data_new.tail(300), root=tmp_path)
+
+    assert list_exports(root=tmp_path) == ['GC=F']
+    assert len(read_analysis('indicators', 'GC=F', root=tmp_path)) == 300
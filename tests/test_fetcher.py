@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pytest
+
+from fake_provider import FakeProvider
+from fetcher import BACKGROUND, INTERACTIVE, FetchScheduler, SymbolNotFoundError
+
+
+def make_scheduler(provider, **options):
+    options = {'rate': 1000, 'burst': 1000, 'base_delay': 0.01, 'max_delay': 0.05, 'timeout': 30, **options}
+    return FetchScheduler(provider=provider, **options)
+
+def block_worker(scheduler):
+    # Tek işçiyi meşgul ederek sonraki isteklerin kuyrukta birikmesini sağlar
+    release = threading.Event()
+    started = threading.Event()
+    scheduler.submit(('block',), lambda: (started.set(), release.wait(5)), INTERACTIVE)
+    started.wait(5)
+    return release
+
+
+def test_download_retries_after_provider_throttling():
+    provider = FakeProvider(max_calls_per_second=2)
+    scheduler = make_scheduler(provider, workers=4, max_retries=6, base_delay=0.2, max_delay=1.0)
+
+    symbols = [f"SIM{i:03d}.IS" for i in range(6)]
+    threads = [threading.Thread(target=scheduler.download, args=(symbol,), kwargs={'period': '1mo'}) for symbol in symbols]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics = scheduler.metrics()
+    assert provider.calls['throttled'] > 0
+    assert metrics['throttled'] == provider.calls['throttled']
+    assert metrics['retries'] >= metrics['throttled']
+    assert metrics['failures'] == 0
+    assert provider.calls['download'] - provider.calls['throttled'] == len(symbols)
+
+def test_download_raises_after_retries_are_exhausted():
+    provider = FakeProvider(failure_rate=1.0)
+    scheduler = make_scheduler(provider, max_retries=2)
+
+    with pytest.raises(ConnectionError):
+        scheduler.download('SIM000.IS', period='1mo')
+    assert scheduler.metrics()['upstream_calls'] == 3
+    assert scheduler.metrics()['failures'] == 1
+
+def test_partial_batch_is_returned_without_retries():
+    provider = FakeProvider(unknown_symbols={'YOK.IS'})
+    scheduler = make_scheduler(provider, max_retries=4, base_delay=0.5)
+
+    data = scheduler.download(['SIM000.IS', 'YOK.IS'], period='1mo')
+    assert set(data.columns.get_level_values(1)) == {'SIM000.IS'}
+    assert provider.calls['download'] == 1
+    assert scheduler.metrics()['partial'] == 1
+    assert scheduler.metrics()['retries'] == 0
+
+def test_unknown_symbol_fails_fast_without_global_cooldown():
+    provider = FakeProvider(unknown_symbols={'YOK.IS'})
+    scheduler = make_scheduler(provider, workers=1, max_retries=4, base_delay=0.2, max_delay=1.0)
+
+    started = time.perf_counter()
+    with pytest.raises(SymbolNotFoundError):
+        scheduler.download('YOK.IS', period='1mo')
+    assert time.perf_counter() - started < 0.5
+    assert provider.calls['download'] == 2
+    assert scheduler.metrics()['throttled'] == 0
+
+    started = time.perf_counter()
+    scheduler.download('SIM000.IS', period='1mo')
+    assert time.perf_counter() - started < 0.1
+
+def test_concurrent_identical_requests_are_deduplicated():
+    provider = FakeProvider(latency=0.2)
+    scheduler = make_scheduler(provider, workers=4)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(scheduler.download('SIM000.IS', period='1mo'))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 5
+    assert provider.calls['download'] == 1
+    assert scheduler.metrics()['deduplicated'] == 4
+
+def test_interactive_requests_run_before_background():
+    scheduler = make_scheduler(FakeProvider(), workers=1)
+    release = block_worker(scheduler)
+
+    order = []
+    futures = [scheduler.submit(('job', name), lambda name=name: order.append(name), priority) for name, priority in
+               [('arka-1', BACKGROUND), ('arka-2', BACKGROUND), ('kullanıcı', INTERACTIVE)]]
+    release.set()
+    for future in futures:
+        future.result(5)
+
+    assert order == ['kullanıcı', 'arka-1', 'arka-2']
+
+def test_deduplicated_request_is_promoted_to_higher_priority():
+    scheduler = make_scheduler(FakeProvider(), workers=1)
+    release = block_worker(scheduler)
+
+    order = []
+    background = [scheduler.submit(('job', i), lambda i=i: order.append(i), BACKGROUND) for i in range(4)]
+    promoted = scheduler.submit(('job', 3), lambda: order.append(3), INTERACTIVE)
+    release.set()
+    for future in background:
+        future.result(5)
+    time.sleep(0.05)
+
+    assert promoted is background[3]
+    assert order == [3, 0, 1, 2]
+    assert scheduler.metrics()['promoted'] == 1
+    assert scheduler.metrics()['inflight'] == 0
+
+def test_ticker_attrs_fetch_concurrently_with_group_timeout():
+    scheduler = make_scheduler(FakeProvider(latency=0.3), workers=4)
+    attrs = ('info', 'balance_sheet', 'financials', 'cashflow')
+
+    started = time.perf_counter()
+    result = scheduler.ticker_attrs('SIM000.IS', attrs)
+    assert time.perf_counter() - started < 0.9
+    assert list(result) == list(attrs)
+
+    slow = make_scheduler(FakeProvider(latency=1.0), workers=4)
+    with pytest.raises(TimeoutError):
+        slow.ticker_attrs('SIM001.IS', attrs, timeout=0.2)
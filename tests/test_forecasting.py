@@ -0,0 +1,35 @@
+import pandas as pd
+
+from export import read_analysis
+from fake_provider import FakeProvider
+from forecasting import forecast_batch
+from indicators import prepare_price_frame
+
+
+def price_series(symbol, days=250):
+    return prepare_price_frame(FakeProvider().download(symbol, start='2023-01-02', end='2024-01-01')).tail(days)
+
+
+def test_failing_series_is_isolated_from_the_batch(tmp_path):
+    # Tek satırlık seride Prophet hata verir; diğer seri etkilenmemeli
+    series = {'AAA.IS': price_series('AAA.IS'), 'KISA.IS': price_series('KISA.IS', days=1)}
+    results, forecasts, stats = forecast_batch(series, periods=10, max_workers=2, store_root=str(tmp_path))
+
+    assert list(forecasts) == ['AAA.IS']
+    assert len(forecasts['AAA.IS']) == len(series['AAA.IS']) + 10
+    assert pd.isna(results.loc['AAA.IS', 'Hata'])
+    assert results.loc['AAA.IS', 'MAPE'] >= 0
+    assert results.loc['KISA.IS', 'Hata'].startswith('ValueError')
+    assert stats['series'] == 2 and stats['succeeded'] == 1 and stats['failed'] == 1
+
+    assert len(read_analysis('forecast', 'AAA.IS', root=str(tmp_path))) == len(forecasts['AAA.IS'])
+    assert read_analysis('forecast', 'KISA.IS', root=str(tmp_path)).empty
+
+def test_timeout_is_reported_per_series():
+    series = {'AAA.IS': price_series('AAA.IS'), 'BBB.IS': price_series('BBB.IS')}
+    results, forecasts, stats = forecast_batch(series, periods=10, max_workers=1, timeout=0.001)
+
+    assert forecasts == {}
+    assert all(error.startswith('ForecastTimeout') for error in results['Hata'])
+    assert stats['failed'] == 2
+    assert stats['series_per_minute'] == 0
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fundamentals import RATIOS, compute_ratios, latest_ratios, peer_ratios, statement_panel
+
+PERIODS = pd.DatetimeIndex(['2024-12-31', '2023-12-31', '2022-12-31'])
+
+
+def statements(revenue, net_income, debt=(50, 50, 50)):
+    # yfinance tabloları gibi: satırlar kalemler, sütunlar en yeni dönem önce
+    return {
+        'financials': pd.DataFrame({
+            period: {'Total Revenue': r, 'Gross Profit': r * 0.3, 'Net Income': n}
+            for period, r, n in zip(PERIODS, revenue, net_income)
+        }),
+        'balance_sheet': pd.DataFrame({
+            period: {'Total Debt': d, 'Stockholders Equity': 100.0, 'Current Assets': 80.0, 'Current Liabilities': 40.0}
+            for period, d in zip(PERIODS, debt)
+        })
+    }
+
+
+def test_ratios_are_computed_per_period():
+    ratios = compute_ratios(statement_panel({'AAA.IS': statements((200, 150, 100), (20, 15, 10))}))
+
+    latest = ratios.loc[('AAA.IS', PERIODS[0])]
+    assert latest['Brüt Kâr Marjı (%)'] == pytest.approx(30)
+    assert latest['Net Kâr Marjı (%)'] == pytest.approx(10)
+    assert latest['Borç / Öz Sermaye'] == pytest.approx(0.5)
+    assert latest['Cari Oran'] == pytest.approx(2)
+    # Tablolarda bulunmayan kalemlere dayanan oranlar NaN kalır
+    assert np.isnan(latest['FAVÖK Marjı (%)'])
+
+def test_growth_uses_previous_period_of_the_same_ticker():
+    panel = statement_panel({
+        'AAA.IS': statements((200, 150, 100), (20, -10, 5)),
+        'BBB.IS': statements((90, 100, 120), (5, 5, 5))
+    })
+    growth = compute_ratios(panel)['Gelir Büyümesi (%)']
+
+    assert np.isnan(growth[('AAA.IS', PERIODS[2])])
+    assert growth[('AAA.IS', PERIODS[1])] == pytest.approx(50)
+    assert growth[('AAA.IS', PERIODS[0])] == pytest.approx(100 / 3)
+    # İlk dönem bir önceki hisseden büyüme almaz
+    assert np.isnan(growth[('BBB.IS', PERIODS[2])])
+    assert growth[('BBB.IS', PERIODS[0])] == pytest.approx(-10)
+
+def test_growth_from_negative_base_keeps_direction():
+    ratios = compute_ratios(statement_panel({'AAA.IS': statements((200, 150, 100), (20, -10, 5))}))
+    net_growth = ratios['Net Kâr Büyümesi (%)']
+
+    assert net_growth[('AAA.IS', PERIODS[1])] == pytest.approx(-300)
+    # Zarardan kâra geçiş pozitif büyüme olarak görünür
+    assert net_growth[('AAA.IS', PERIODS[0])] == pytest.approx(300)
+
+def test_zero_denominator_gives_nan_instead_of_infinity():
+    ratios = compute_ratios(statement_panel({'AAA.IS': statements((200, 0, 100), (20, 0, 10))}))
+    assert np.isnan(ratios.loc[('AAA.IS', PERIODS[1]), 'Net Kâr Marjı (%)'])
+    assert np.isnan(ratios.loc[('AAA.IS', PERIODS[0]), 'Gelir Büyümesi (%)'])
+
+def test_peer_ratios_add_median_row_and_skip_missing_statements():
+    peers = {
+        'AAA.IS': statements((200, 150, 100), (20, 15, 10), debt=(20, 20, 20)),
+        'BBB.IS': statements((100, 100, 100), (5, 5, 5), debt=(50, 50, 50)),
+        'CCC.IS': statements((300, 200, 100), (60, 30, 10), debt=(80, 80, 80)),
+        'YOK.IS': {'financials': pd.DataFrame(), 'balance_sheet': None}
+    }
+    ratios, table = peer_ratios(peers)
+
+    assert set(ratios.index.get_level_values('Hisse')) == {'AAA.IS', 'BBB.IS', 'CCC.IS'}
+    assert list(table.index) == ['AAA.IS', 'BBB.IS', 'CCC.IS', 'Emsal Medyanı']
+    assert (table.loc[['AAA.IS', 'BBB.IS', 'CCC.IS'], 'Dönem'] == PERIODS[0]).all()
+    assert table.loc['Emsal Medyanı', 'Borç / Öz Sermaye'] == pytest.approx(0.5)
+    assert table.loc['Emsal Medyanı', 'Net Kâr Marjı (%)'] == pytest.approx(10)
+    assert set(RATIOS) <= set(table.columns)
+
+def test_latest_ratios_skip_periods_without_data():
+    frame = statements((200, 150, 100), (20, 15, 10))
+    frame['financials'][PERIODS[0]] = np.nan
+    frame['balance_sheet'][PERIODS[0]] = np.nan
+    latest = latest_ratios(compute_ratios(statement_panel({'AAA.IS': frame})))
+    assert latest.loc['AAA.IS', 'Dönem'] == PERIODS[1]
+
+def test_peer_ratios_without_statements_are_empty():
+    ratios, table = peer_ratios({'YOK.IS': {}})
+    assert ratios.empty and table.empty
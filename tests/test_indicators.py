@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import IndicatorCache, compute_indicators, indicator_node, resolve_indicators
+
+
+def price_frame(bars=300, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+    spread = np.abs(rng.normal(0, 0.01, bars)) * close
+    return pd.DataFrame({
+        'Tarih': pd.bdate_range('2022-01-03', periods=bars),
+        'Kapanış': close,
+        'Hacim': rng.integers(100_000, 1_000_000, bars).astype(float),
+        'Yüksek': close + spread,
+        'Düşük': close - spread
+    })
+
+def reference_indicator_frame(data_new):
+    # Kayıt sisteminden önceki build_indicator_frame'in birebir kopyası
+    data_new = data_new.copy()
+    close, high, low = data_new['Kapanış'], data_new['Yüksek'], data_new['Düşük']
+    data_new['MA20'] = close.rolling(20).mean()
+    data_new['MA50'] = close.rolling(50).mean()
+    data_new['MA200'] = close.rolling(200).mean()
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    data_new['RSI'] = 100 - (100 / (1 + gain / loss))
+    sma, std = close.rolling(window=20).mean(), close.rolling(window=20).std()
+    data_new['BB_SMA'], data_new['BB_Upper'], data_new['BB_Lower'] = sma, sma + std * 2, sma - std * 2
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    signal_line = macd.ewm(span=9, adjust=False).mean()
+    data_new['MACD'], data_new['MACD_Signal'], data_new['MACD_Hist'] = macd, signal_line, macd - signal_line
+    data_new['Hacim_Fark'] = data_new['Hacim'].diff()
+    tenkan_sen = (high.rolling(9).max() + low.rolling(9).min()) / 2
+    kijun_sen = (high.rolling(26).max() + low.rolling(26).min()) / 2
+    data_new['Tenkan_Sen'], data_new['Kijun_Sen'] = tenkan_sen, kijun_sen
+    data_new['Senkou_Span_A'] = (tenkan_sen + kijun_sen) / 2
+    data_new['Senkou_Span_B'] = (high.rolling(52).max() + low.rolling(52).min()) / 2
+    return data_new
+
+
+def test_default_output_matches_reference_frame():
+    data_new = price_frame()
+    pd.testing.assert_frame_equal(compute_indicators(data_new), reference_indicator_frame(data_new), check_like=True)
+
+def test_resolve_orders_inputs_first_and_shares_nodes():
+    targets, order = resolve_indicators([('Bollinger', {}), ('MA', {'window': 20}), ('MACD', {}), ('EMA', {'span': 26})])
+
+    assert targets == [indicator_node('Bollinger'), indicator_node('MA', {'window': 20}), indicator_node('MACD'), indicator_node('EMA', {'span': 26})]
+    assert order.count(indicator_node('MA', {'window': 20})) == 1
+    assert order.count(indicator_node('EMA', {'span': 26})) == 1
+    assert order.index(indicator_node('MA', {'window': 20})) < order.index(indicator_node('Bollinger'))
+    assert order.index(indicator_node('EMA', {'span': 12})) < order.index(indicator_node('MACD'))
+
+def test_cache_reuses_nodes_until_prices_change():
+    data_new = price_frame()
+    cache = IndicatorCache()
+
+    first = compute_indicators(data_new, [('MACD', {})], cache)
+    assert cache.stats()['misses'] == 3
+    # EMA12 MACD'den önbelleğe alınmıştı; yalnızca yeni gösterge hesaplanır
+    second = compute_indicators(data_new, [('MACD', {}), ('EMA', {'span': 12})], cache)
+    assert cache.stats()['hits'] == 3
+    assert cache.stats()['misses'] == 3
+    pd.testing.assert_series_equal(first['MACD'], second['MACD'])
+
+    changed = data_new.assign(Kapanış=data_new['Kapanış'] * 1.01)
+    compute_indicators(changed, [('MACD', {})], cache)
+    assert cache.stats()['misses'] == 6
+
+def test_requested_params_change_only_their_outputs():
+    data_new = price_frame()
+    frame = compute_indicators(data_new, [('MA', {'window': 20}), ('MACD', {'fast': 5, 'slow': 35, 'signal': 5})])
+
+    assert 'RSI' not in frame.columns
+    expected = data_new['Kapanış'].ewm(span=5, adjust=False).mean() - data_new['Kapanış'].ewm(span=35, adjust=False).mean()
+    pd.testing.assert_series_equal(frame['MACD'], expected, check_names=False)
+
+def test_macd_fast_period_must_be_below_slow():
+    with pytest.raises(ValueError):
+        indicator_node('MACD', {'fast': 100, 'slow': 3})
+    with pytest.raises(ValueError):
+        compute_indicators(price_frame(), [('MACD', {'fast': 26, 'slow': 26})])
+
+def test_conflicting_output_columns_are_rejected():
+    with pytest.raises(ValueError, match='RSI'):
+        compute_indicators(price_frame(), [('RSI', {'periods': 14}), ('RSI', {'periods': 7})])
+    # Aynı istek iki kez gelirse tek düğüm olarak hesaplanır
+    targets, _ = resolve_indicators([('RSI', {}), ('RSI', {'periods': 14})])
+    assert targets == [indicator_node('RSI')]
+
+def test_unknown_indicator_or_param_is_rejected():
+    with pytest.raises(ValueError):
+        indicator_node('Stokastik')
+    with pytest.raises(ValueError):
+        indicator_node('RSI', {'window': 14})
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import fetcher
+from fake_provider import FakeProvider
+from fetcher import FetchScheduler
+from indicators import build_indicator_frame, find_crosses
+from screener import TAIL_BARS, ScreenerIndex
+
+
+def price_frame(close, start='2020-01-01'):
+    close = np.asarray(close, dtype=float)
+    return pd.DataFrame({
+        'Tarih': pd.bdate_range(start, periods=len(close)),
+        'Kapanış': close,
+        'Hacim': 1_000_000.0,
+        'Yüksek': close * 1.01,
+        'Düşük': close * 0.99
+    })
+
+def cross_prices():
+    # Düşüşün ardından tek bir Golden Cross üreten ve sonrasında TAIL_BARS'tan uzun süren yükseliş
+    return np.concatenate([np.linspace(200, 100, 300), np.linspace(100, 400, TAIL_BARS + 150)])
+
+
+def test_ingest_skips_unchanged_bar_and_appends_new_bars(tmp_path):
+    index = ScreenerIndex(root=str(tmp_path))
+    frame = price_frame(np.linspace(100, 150, 260))
+
+    assert index.ingest('SIM.IS', frame.iloc[:250])
+    assert not index.ingest('SIM.IS', frame.iloc[:250])
+    assert index.ingest('SIM.IS', frame.iloc[245:])
+
+    assert index.index.loc['SIM.IS', 'Tarih'] == frame['Tarih'].iloc[-1]
+    assert len(index._tails['SIM.IS']) == 260
+    assert index.index.loc['SIM.IS', 'Kapanış'] == pytest.approx(150)
+
+def test_ingest_replaces_partial_last_bar(tmp_path):
+    index = ScreenerIndex(root=str(tmp_path))
+    frame = price_frame(np.linspace(100, 150, 250))
+    index.ingest('SIM.IS', frame)
+
+    revised = frame.iloc[-1:].assign(Kapanış=155.0)
+    assert index.ingest('SIM.IS', revised)
+    assert len(index._tails['SIM.IS']) == 250
+    assert index.index.loc['SIM.IS', 'Kapanış'] == 155.0
+
+def test_cross_counter_carries_over_beyond_tail_window(tmp_path):
+    frame = price_frame(cross_prices())
+    golden, _ = find_crosses(build_indicator_frame(frame))
+    assert len(golden) == 1
+    expected = len(frame) - 1 - golden.index[0]
+    assert expected >= TAIL_BARS
+
+    index = ScreenerIndex(root=str(tmp_path))
+    index.ingest('SIM.IS', frame.iloc[:golden.index[0] + 10])
+    # Yeni barlar parça parça gelir; kesişim zamanla pencerenin dışına kayar
+    for start in range(golden.index[0] + 10, len(frame), 25):
+        index.ingest('SIM.IS', frame.iloc[start:start + 25])
+
+    assert index.index.loc['SIM.IS', 'Golden_Cross_Gün'] == expected
+    assert index.index.loc['SIM.IS', 'Son_Golden_Cross'] == golden['Tarih'].iloc[0]
+
+def test_update_downloads_only_new_bars_and_persists(tmp_path, monkeypatch):
+    provider = FakeProvider(unknown_symbols={'YOK.IS'})
+    monkeypatch.setattr(fetcher, '_scheduler', FetchScheduler(provider=provider, rate=1000, burst=1000, base_delay=0.01))
+
+    index = ScreenerIndex(root=str(tmp_path))
+    assert sorted(index.update(['SIM000.IS', 'SIM001.IS', 'YOK.IS'])) == ['SIM000.IS', 'SIM001.IS']
+    assert provider.calls['download'] == 1
+    assert index.update(['SIM000.IS', 'SIM001.IS']) == []
+
+    reloaded = ScreenerIndex(root=str(tmp_path))
+    assert sorted(reloaded.index.index) == ['SIM000.IS', 'SIM001.IS']
+    assert reloaded.index.loc['SIM000.IS', 'Tarih'] == index.index.loc['SIM000.IS', 'Tarih']
+
+def test_query_filters_with_columns_and_boolean_operators(tmp_path):
+    index = ScreenerIndex(root=str(tmp_path))
+    index.index = pd.DataFrame({
+        'RSI': [25.0, 75.0, np.nan],
+        'Bulut_Üstü': [True, False, True],
+        'Golden_Cross_Gün': [3.0, np.nan, 40.0]
+    }, index=pd.Index(['A.IS', 'B.IS', 'C.IS'], name='Hisse'))
+
+    assert list(index.query('RSI < 30 and Bulut_Üstü and Golden_Cross_Gün <= 20').index) == ['A.IS']
+    assert list(index.query('not Bulut_Üstü or RSI > 70').index) == ['B.IS']
+    assert list(index.query('20 < Golden_Cross_Gün <= 50').index) == ['C.IS']
+    assert list(index.query('RSI >= -1').index) == ['A.IS', 'B.IS']
+
+@pytest.mark.parametrize('expression', [
+    'RSI.__class__',
+    "__import__('os').system('true')",
+    'RSI[0] > 1',
+    '@RSI > 1',
+    'RSI + 1 > 2',
+    'Yok > 1',
+    '[c for c in RSI]'
+])
+def test_query_rejects_expressions_outside_the_whitelist(tmp_path, expression):
+    index = ScreenerIndex(root=str(tmp_path))
+    index.index = pd.DataFrame({'RSI': [25.0]}, index=pd.Index(['A.IS'], name='Hisse'))
+
+    with pytest.raises(ValueError):
+        index.query(expression)
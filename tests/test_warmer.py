@@ -0,0 +1,82 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+import fetcher
+import warmer
+from fake_provider import FakeProvider
+from fetcher import FetchScheduler
+from warmer import WARM_TASKS, WARM_TIMEZONE, CacheWarmer, UsageTracker
+
+
+def failing_task(ticker, start, end):
+    raise LookupError(f"{ticker} için veri bulunamadı")
+
+
+def test_warm_reports_coverage_and_failures():
+    calls = []
+    lock = threading.Lock()
+
+    def price_task(ticker, start, end):
+        with lock:
+            calls.append(ticker)
+
+    def fundamentals_task(ticker, start, end):
+        if ticker == 'YOK.IS':
+            failing_task(ticker, start, end)
+
+    cache_warmer = CacheWarmer(tickers=['A.IS', 'B.IS', 'YOK.IS'], tasks={'Fiyat': price_task, 'Temel': fundamentals_task}, concurrency=2)
+    report = cache_warmer.warm()
+
+    assert sorted(calls) == ['A.IS', 'B.IS', 'YOK.IS']
+    assert report['tickers'] == 3
+    assert report['coverage_pct'] == pytest.approx(83.3)
+    assert report['task_coverage_pct'] == {'Fiyat': 100.0, 'Temel': pytest.approx(66.7)}
+    assert report['failed'] == {'YOK.IS': {'Temel': 'YOK.IS için veri bulunamadı'}}
+    assert cache_warmer.last_report is report
+
+@pytest.mark.parametrize('now, expected', [
+    # Pazartesi sabahı ısıtılan fiyatlar aynı günün kapanışına kadar geçerlidir
+    (datetime(2026, 10, 19, 9, 0), datetime(2026, 10, 19, 18, 10)),
+    # Cuma kapanıştan sonra bir sonraki kapanış Pazartesi'dir; PRICE_TTL üst sınırı uygulanır
+    (datetime(2026, 10, 23, 19, 0), datetime(2026, 10, 24, 19, 0))
+])
+def test_prices_expire_at_next_market_close(monkeypatch, now, expected):
+    class FixedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now.replace(tzinfo=tz)
+
+    monkeypatch.setattr(warmer, 'datetime', FixedDatetime)
+    report = CacheWarmer(tickers=['A.IS'], tasks={'Fiyat': lambda *args: None}).warm()
+    assert datetime.fromisoformat(report['prices_expire_at']) == expected.replace(tzinfo=WARM_TIMEZONE)
+
+def test_warm_with_no_tickers_reports_full_coverage():
+    report = CacheWarmer(tickers=[], tasks={'Fiyat': failing_task}).warm()
+    assert report['coverage_pct'] == 100.0
+    assert report['failed'] == {}
+
+def test_warm_runs_real_tasks_through_the_scheduler(monkeypatch):
+    provider = FakeProvider(unknown_symbols={'YOK.IS'})
+    monkeypatch.setattr(fetcher, '_scheduler', FetchScheduler(provider=provider, rate=1000, burst=1000, base_delay=0.01))
+    tasks = {name: WARM_TASKS[name] for name in ('Fiyat ve Göstergeler', 'Temel Veriler')}
+
+    report = CacheWarmer(tickers=['SIM000.IS', 'YOK.IS'], tasks=tasks).warm()
+
+    assert report['task_coverage_pct']['Fiyat ve Göstergeler'] == 50.0
+    assert set(report['failed']) == {'YOK.IS'}
+    assert 'Fiyat ve Göstergeler' in report['failed']['YOK.IS']
+
+def test_tickers_include_recent_usage_without_duplicates(tmp_path):
+    usage = UsageTracker(path=str(tmp_path / 'usage.json'))
+    for ticker in ['B.IS', 'C.IS', 'C.IS']:
+        usage.record(ticker)
+
+    assert CacheWarmer(tickers=['A.IS', 'B.IS'], usage=usage).tickers() == ['A.IS', 'B.IS', 'C.IS']
+    assert UsageTracker(path=str(tmp_path / 'usage.json')).top(1) == ['C.IS']
+
+def test_next_run_skips_weekends():
+    cache_warmer = CacheWarmer(tickers=[])
+    next_run = datetime.now(WARM_TIMEZONE).timestamp() + cache_warmer.seconds_until_next_run('09:00')
+    assert datetime.fromtimestamp(next_run, WARM_TIMEZONE).weekday() < 5
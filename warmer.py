@@ -0,0 +1,154 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from fetcher import BACKGROUND
+from loaders import DEFAULT_START, PRICE_TTL, get_comparison_closes, load_forecast, load_fundamentals, load_indicator_frame, next_market_close
+
+WARM_TICKERS = [
+    symbol.strip()
+    for symbol in os.environ.get('HISSE_WARM_TICKERS', 'KCHOL.IS,THYAO.IS,GARAN.IS,AKBNK.IS,ASELS.IS,BIMAS.IS,EREGL.IS,TUPRS.IS,SISE.IS,YKBNK.IS').split(',')
+    if symbol.strip()
+]
+WARM_CONCURRENCY = int(os.environ.get('HISSE_WARM_CONCURRENCY', '4'))
+# BIST sürekli işlemleri 10:00'da başlar; ısıtma açılıştan önce biter
+WARM_AT = os.environ.get('HISSE_WARM_AT', '09:00')
+WARM_TIMEZONE = ZoneInfo('Europe/Istanbul')
+
+USAGE_FILE = os.environ.get('HISSE_USAGE_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'usage.json'))
+USAGE_DAYS = 7
+USAGE_TOP_N = 20
+
+WARM_TASKS = {
+    'Fiyat ve Göstergeler': lambda ticker, start, end: load_indicator_frame(ticker, start, end, _priority=BACKGROUND),
+    'Tahmin': lambda ticker, start, end: load_forecast(ticker, start, end, _priority=BACKGROUND),
+    'Temel Veriler': lambda ticker, start, end: load_fundamentals(ticker, _priority=BACKGROUND),
+    'Getiri Karşılaştırması': lambda ticker, start, end: get_comparison_closes(ticker, _priority=BACKGROUND)
+}
+
+
+###########################
+# Kullanım İstatistikleri
+###########################
+class UsageTracker:
+    def __init__(self, path=USAGE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding='utf-8') as f:
+                self._days = json.load(f)
+        except (OSError, ValueError):
+            self._days = {}
+
+    def record(self, ticker):
+        today = date.today().isoformat()
+        with self._lock:
+            counts = self._days.setdefault(today, {})
+            counts[ticker] = counts.get(ticker, 0) + 1
+            cutoff = (date.today() - timedelta(days=USAGE_DAYS)).isoformat()
+            self._days = {day: day_counts for day, day_counts in self._days.items() if day > cutoff}
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    json.dump(self._days, f)
+            except OSError:
+                pass
+
+    def top(self, n=USAGE_TOP_N):
+        totals = Counter()
+        with self._lock:
+            for counts in self._days.values():
+                totals.update(counts)
+        return [ticker for ticker, _ in totals.most_common(n)]
+
+
+###########################
+# Önbellek Isıtıcı
+###########################
+class CacheWarmer:
+    def __init__(self, tickers=WARM_TICKERS, tasks=WARM_TASKS, concurrency=WARM_CONCURRENCY, usage=None):
+        self.configured_tickers = list(tickers)
+        self.tasks = tasks
+        self.concurrency = concurrency
+        self.usage = usage
+        self.last_report = None
+        self._thread = None
+
+    def tickers(self):
+        recent = self.usage.top() if self.usage is not None else []
+        return list(dict.fromkeys(self.configured_tickers + recent))
+
+    def warm(self, tickers=None):
+        tickers = self.tickers() if tickers is None else list(tickers)
+        started_at = datetime.now(WARM_TIMEZONE)
+        started = time.monotonic()
+        end = date.today()
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='cache-warmer') as executor:
+            futures = {executor.submit(self._warm_ticker, ticker, DEFAULT_START, end): ticker for ticker in tickers}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        total = len(tickers) * len(self.tasks)
+        succeeded = sum(error is None for statuses in results.values() for error in statuses.values())
+        self.last_report = {
+            'started_at': started_at.isoformat(timespec='seconds'),
+            # Isıtılan fiyat kayıtları bir sonraki kapanışta (en geç PRICE_TTL sonunda) yenilenir
+            'prices_expire_at': min(next_market_close(started_at), started_at + timedelta(seconds=PRICE_TTL)).isoformat(timespec='seconds'),
+            'duration_s': round(time.monotonic() - started, 2),
+            'tickers': len(tickers),
+            'coverage_pct': round(succeeded / total * 100, 1) if total else 100.0,
+            'task_coverage_pct': {
+                name: round(sum(results[ticker][name] is None for ticker in tickers) / len(tickers) * 100, 1) if tickers else 100.0
+                for name in self.tasks
+            },
+            'failed': {
+                ticker: {name: error for name, error in statuses.items() if error is not None}
+                for ticker, statuses in results.items()
+                if any(error is not None for error in statuses.values())
+            }
+        }
+        return self.last_report
+
+    def _warm_ticker(self, ticker, start, end):
+        statuses = {}
+        for name, task in self.tasks.items():
+            try:
+                task(ticker, start, end)
+                statuses[name] = None
+            except Exception as e:
+                statuses[name] = str(e)
+        return statuses
+
+    def seconds_until_next_run(self, at=WARM_AT):
+        hour, minute = (int(part) for part in at.split(':'))
+        now = datetime.now(WARM_TIMEZONE)
+        next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        # Hafta sonu piyasa kapalı, ısıtma Pazartesi sabahına kalır
+        while next_run.weekday() >= 5:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+
+    def start_schedule(self, at=WARM_AT):
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+
+        def loop():
+            while True:
+                time.sleep(self.seconds_until_next_run(at))
+                try:
+                    self.warm()
+                except Exception as e:
+                    print(f"Önbellek ısıtma hatası: {e}")
+
+        self._thread = threading.Thread(target=loop, daemon=True, name='cache-warmer-schedule')
+        self._thread.start()
+        return self._thread